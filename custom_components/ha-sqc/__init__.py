@@ -5,33 +5,93 @@ import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
-from .coordinator import SQCDataUpdateCoordinator
+from .const import CONF_LONG_TERM_STATISTICS, DATA_HUB, DOMAIN, STORAGE_VERSION
+from .coordinator import SQCDataUpdateCoordinator, storage_key
+from .hub import SQCHub
+from .long_term import SQCStatistics
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BINARY_SENSOR]
+PLATFORMS: list[Platform] = [
+    Platform.SENSOR,
+    Platform.BINARY_SENSOR,
+]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the services of the integration."""
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up SQC from a config entry."""
     hass.data.setdefault(DOMAIN, {})
+    if (hub := hass.data.get(DATA_HUB)) is None:
+        hub = hass.data[DATA_HUB] = SQCHub(hass)
     
-    coordinator = SQCDataUpdateCoordinator(hass, entry.data)
+    coordinator = SQCDataUpdateCoordinator(hass, entry, hub)
+    entry.async_on_unload(coordinator.async_shutdown)
+    if entry.options.get(CONF_LONG_TERM_STATISTICS, False):
+        await _async_setup_statistics(hass, entry, coordinator)
     
-    await coordinator.async_config_entry_first_refresh()
+    if await coordinator.async_load_cached():
+        # Start with the last known readings, the hub refreshes them soon.
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} refresh {entry.entry_id}"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
     
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    entry.async_on_unload(hub.async_register(entry.entry_id, coordinator))
     
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    coordinator.async_track_fields()
+
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
     
     return True
 
 
+async def _async_setup_statistics(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: SQCDataUpdateCoordinator
+) -> None:
+    """Aggregate readings into hourly long-term statistics."""
+    if "recorder" not in hass.config.components:
+        _LOGGER.warning("Long-term statistics of %s need the recorder", entry.title)
+        return
+    statistics = SQCStatistics(hass, entry.entry_id, entry.title)
+    await statistics.async_load()
+    coordinator.statistics = statistics
+    # Shortly after every full hour, import the hour that just ended.
+    entry.async_on_unload(
+        async_track_utc_time_change(hass, statistics.async_flush, minute=0, second=30)
+    )
+    entry.async_on_unload(statistics.async_flush)
+
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
     
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached snapshot of a deleted config entry."""
+    await Store(hass, STORAGE_VERSION, storage_key(entry.entry_id)).async_remove()
@@ -2,25 +2,51 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable
+from dataclasses import dataclass
 from typing import Any
-import re
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
+    BinarySensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfTemperature
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import ALARM_NONE, DOMAIN
 from .coordinator import SQCDataUpdateCoordinator
+from .entity import SQCEntity
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, kw_only=True)
+class SQCBinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Describes an SQC binary sensor read from one field of the home page."""
+
+    field: str
+    is_on_fn: Callable[[Any], bool] = bool
+
+
+BINARY_SENSOR_DESCRIPTIONS: tuple[SQCBinarySensorEntityDescription, ...] = (
+    SQCBinarySensorEntityDescription(
+        key="ph_control",
+        field="ph_control",
+        name="PH Control",
+    ),
+    SQCBinarySensorEntityDescription(
+        key="alarm",
+        field="alarm",
+        name="Alarm",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        is_on_fn=lambda alarm: alarm != ALARM_NONE,
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -29,84 +55,39 @@ async def async_setup_entry(
     """Set up the sensor platform."""
     coordinator: SQCDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id]
     
-    # Define your sensors here
-    entities = [
-        SQCPHControlBinarySensor(coordinator, config_entry),
-    ]
-    
-    async_add_entities(entities)
+    async_add_entities(
+        SQCBinarySensor(coordinator, config_entry, description)
+        for description in BINARY_SENSOR_DESCRIPTIONS
+    )
 
-class SQCBinarySensorBase(CoordinatorEntity[SQCDataUpdateCoordinator], BinarySensorEntity):
+class SQCBinarySensorBase(SQCEntity, BinarySensorEntity):
     """Base class for SQC binary sensors."""
 
-    def __init__(
-        self,
-        coordinator: SQCDataUpdateCoordinator,
-        config_entry: ConfigEntry,
-        sensor_key: str,
-        sensor_name: str,
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._sensor_key = sensor_key
-        self._attr_name = sensor_name
-        self._attr_unique_id = f"{config_entry.entry_id}_{sensor_key}" 
-        self._attr_device_info = self.coordinator._get_device_info(config_entry.entry_id)
-    @property
-    def available(self) -> bool:
-        """Return True if the sensor is available."""
-        return self.coordinator.last_update_success and self.coordinator.data.get("online", False)
-
-class SQCPHControlBinarySensor(SQCBinarySensorBase):
-    """ PH Control state for SQC."""
+    def _state_key(self) -> tuple[Any, ...]:
+        """Return everything that ends up in this entity's state."""
+        return (*super()._state_key(), self.is_on)
 
-    def __init__(
-        self,
-        coordinator: SQCDataUpdateCoordinator,
-        config_entry: ConfigEntry,
-    ) -> None:
-        """Initialize the PH control state."""
-        super().__init__(coordinator, config_entry, "ph_control", "PH Control")
+class SQCBinarySensor(SQCBinarySensorBase):
+    """Binary sensor for one field of the SQC home page."""
 
-    @property
-    def is_on(self):
-        """Return the state of the sensor."""
-        if not self.coordinator.data:
-            return None
-        
-        html = self.coordinator.data.get("html")
-        if not html:
-            _LOGGER.warning("No sensor data available")
-            return None
-        if "Sterowanie pH:  <b>ON</b>" in html:
-            return True
-        if "Sterowanie pH:  <b>OFF</b>" in html:
-            return False
-        return None
-    
-class SQCAlarmBinarySensor(SQCBinarySensorBase):
-    """ Alarm state for SQC."""
+    entity_description: SQCBinarySensorEntityDescription
 
     def __init__(
         self,
         coordinator: SQCDataUpdateCoordinator,
         config_entry: ConfigEntry,
+        description: SQCBinarySensorEntityDescription,
     ) -> None:
-        """Initialize the Alarm state."""
-        super().__init__(coordinator, config_entry, "alarm", "Alarm")
+        """Initialize the binary sensor."""
+        super().__init__(coordinator, config_entry, description.key, description.name)
+        self.entity_description = description
+        self._field = description.field
 
     @property
     def is_on(self):
         """Return the state of the sensor."""
         if not self.coordinator.data:
             return None
-        
-        html = self.coordinator.data.get("html")
-        if not html:
-            _LOGGER.warning("No sensor data available")
+        if (value := getattr(self.coordinator.data, self._field)) is None:
             return None
-        if "Sterowanie pH:  <b>ON</b>" in html:
-            return True
-        if "Sterowanie pH:  <b>OFF</b>" in html:
-            return False
-        return None
\ No newline at end of file
+        return self.entity_description.is_on_fn(value)
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""Circuit breaker for unreachable SQC controllers."""
+from __future__ import annotations
+
+from enum import StrEnum
+
+
+class BreakerState(StrEnum):
+    """State of the circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop polling a failing device and probe it with exponential backoff.
+
+    Times are plain floats from a monotonic clock supplied by the caller.
+    """
+
+    def __init__(self, threshold: int, base_delay: float, max_delay: float) -> None:
+        """Initialize the breaker."""
+        self.threshold = threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.delay = base_delay
+        self.next_probe: float | None = None
+
+    def allow_request(self, now: float) -> bool:
+        """Return True if a request may be sent to the device."""
+        if self.state is BreakerState.OPEN:
+            if self.next_probe is not None and now < self.next_probe:
+                return False
+            self.state = BreakerState.HALF_OPEN
+        return True
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful request."""
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.delay = self.base_delay
+        self.next_probe = None
+
+    def record_failure(self, now: float) -> None:
+        """Count a failed request and open the breaker when needed."""
+        self.failures += 1
+        if self.state is BreakerState.HALF_OPEN:
+            self.delay = min(self.delay * 2, self.max_delay)
+        elif self.failures < self.threshold:
+            return
+        self.state = BreakerState.OPEN
+        self.next_probe = now + self.delay
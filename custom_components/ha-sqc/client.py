@@ -0,0 +1,210 @@
+"""Asyncio client for SQC controllers, independent of Home Assistant."""
+from __future__ import annotations
+
+import codecs
+import hashlib
+import logging
+import time
+from collections import Counter
+from typing import Any
+
+import aiohttp
+from aiohttp import hdrs
+from aiohttp.http_exceptions import BadHttpMessage
+
+from .const import CHUNK_SIZE, KEEPALIVE_TIMEOUT, LOGIN_RETRIES
+from .models import SQCCachedPage, SQCSnapshot
+from .parser import FIELDS, SQCPageParser
+from .session import SQCSession, SQCSessionExpired
+
+_LOGGER = logging.getLogger(__name__)
+
+HOME_PATH = "/home"
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+
+class SQCClient:
+    """Log in to one controller and read fields from its pages.
+
+    The client owns an HTTP connection to the device that is kept open
+    between requests and shared by logins and page fetches; the device
+    copes badly with concurrent connections. Time spent per phase is added
+    to timings, which the caller may replace before every poll.
+
+    Raises SQCAuthError if the PIN is rejected, SQCSessionExpired if the
+    device keeps rejecting the session after logging in again, and
+    aiohttp.ClientError or TimeoutError if the device cannot be reached.
+    """
+
+    def __init__(self, host: str, pin: str) -> None:
+        """Initialize the client."""
+        self.host = host
+        self.timings: dict[str, float] = {}
+        self.connections: Counter[str] = Counter()
+        # Last parsed result per page and set of fields, and how often a
+        # fetch could reuse it.
+        self._pages: dict[tuple[str, frozenset[str]], SQCCachedPage] = {}
+        self.page_results: Counter[str] = Counter()
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=1, limit_per_host=1, keepalive_timeout=KEEPALIVE_TIMEOUT
+            ),
+            trace_configs=[self._build_trace_config()],
+        )
+        self.sqc_session = SQCSession(self.session, host, pin)
+
+    async def async_close(self) -> None:
+        """Close the connection to the device."""
+        await self.session.close()
+
+    def _add_timing(self, phase: str, value: float) -> None:
+        """Add the duration of a phase to the current timings."""
+        self.timings[phase] = self.timings.get(phase, 0.0) + value
+
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        """Time new connections and count reused ones."""
+        trace_config = aiohttp.TraceConfig()
+
+        async def _on_create_start(session, context, params) -> None:
+            context.connect_start = time.perf_counter()
+
+        async def _on_create_end(session, context, params) -> None:
+            self.connections["opened"] += 1
+            self._add_timing("connect", time.perf_counter() - context.connect_start)
+
+        async def _on_reuse(session, context, params) -> None:
+            self.connections["reused"] += 1
+
+        trace_config.on_connection_create_start.append(_on_create_start)
+        trace_config.on_connection_create_end.append(_on_create_end)
+        trace_config.on_connection_reuseconn.append(_on_reuse)
+        return trace_config
+
+    async def async_fetch_snapshot(
+        self,
+        fields: set[str] | None = None,
+        timeout: aiohttp.ClientTimeout = DEFAULT_TIMEOUT,
+    ) -> SQCSnapshot:
+        """Read fields, or all of them, from the home page."""
+        await self.async_ensure_login()
+        values = await self.async_fetch_fields(
+            HOME_PATH, set(FIELDS) if fields is None else fields, timeout
+        )
+        return SQCSnapshot(**values)
+
+    async def async_ensure_login(self) -> None:
+        """Log in again if the session is about to expire."""
+        if self.sqc_session.expiring:
+            await self.async_login(self.sqc_session.generation)
+
+    async def async_fetch_fields(
+        self,
+        path: str,
+        fields: set[str],
+        timeout: aiohttp.ClientTimeout = DEFAULT_TIMEOUT,
+    ) -> dict[str, Any]:
+        """Read fields from a page, logging in again if the session expired."""
+        for attempt in range(LOGIN_RETRIES + 1):
+            generation = self.sqc_session.generation
+            try:
+                values = await self.async_fetch_page(path, fields, timeout)
+            except SQCSessionExpired:
+                self.sqc_session.mark_expired()
+                if attempt < LOGIN_RETRIES:
+                    _LOGGER.warning("Not logged in, trying to login")
+                    await self.async_login(generation)
+            else:
+                self.sqc_session.mark_valid()
+                return values
+        raise SQCSessionExpired(
+            f"{self.host} still rejects the session after {LOGIN_RETRIES} logins"
+        )
+
+    async def async_login(self, generation: int | None = None) -> None:
+        """Log in and time the round-trip."""
+        start = time.perf_counter()
+        try:
+            await self.sqc_session.async_login(generation)
+        finally:
+            self._add_timing("login", time.perf_counter() - start)
+
+    async def async_fetch_page(
+        self,
+        path: str,
+        fields: set[str],
+        timeout: aiohttp.ClientTimeout = DEFAULT_TIMEOUT,
+    ) -> dict[str, Any]:
+        """Fetch a page and parse the requested fields if it changed.
+
+        The body is held in memory until its fingerprint is known; parsing
+        then stops as soon as every field was found.
+        """
+        url = f"{self.host}{path}"
+        key = (path, frozenset(fields))
+        cached = self._pages.get(key)
+        headers: dict[str, str] = {}
+        if cached is not None:
+            if cached.etag is not None:
+                headers[hdrs.IF_NONE_MATCH] = cached.etag
+            if cached.last_modified is not None:
+                headers[hdrs.IF_MODIFIED_SINCE] = cached.last_modified
+        start = time.perf_counter()
+        try:
+            async with self.session.get(url, timeout=timeout, headers=headers) as resp:
+                self._add_timing("request", time.perf_counter() - start)
+                if resp.status == 304 and cached is not None:
+                    self.page_results["not_modified"] += 1
+                    return cached.values
+                if resp.status != 200:
+                    raise aiohttp.ClientError(f"Bad status {resp.status}")
+
+                # The page is only decoded and parsed if its bytes differ
+                # from the last fetch, which on a stable tank they rarely do.
+                # That takes the whole body, so it is read even though the
+                # fields come first; leaving the rest unread would also close
+                # the kept-alive connection, which costs more than a few KB.
+                body_start = time.perf_counter()
+                digest = hashlib.blake2b(digest_size=16)
+                chunks: list[bytes] = []
+                async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                    digest.update(chunk)
+                    chunks.append(chunk)
+                self._add_timing("body", time.perf_counter() - body_start)
+                charset = resp.charset or "utf-8"
+                etag = resp.headers.get(hdrs.ETAG)
+                last_modified = resp.headers.get(hdrs.LAST_MODIFIED)
+        except BadHttpMessage as err:
+            raise SQCSessionExpired from err
+        except aiohttp.ClientError as err:
+            # A logged out device answers with something that is not HTTP.
+            if "Expected HTTP/" in str(err):
+                raise SQCSessionExpired from err
+            raise
+
+        fingerprint = digest.digest()
+        if cached is not None and cached.fingerprint == fingerprint:
+            self.page_results["unchanged"] += 1
+            return cached.values
+
+        parser = SQCPageParser(fields)
+        decoder = codecs.getincrementaldecoder(charset)()
+        decode = parse = 0.0
+        for chunk in chunks:
+            chunk_start = time.perf_counter()
+            text = decoder.decode(chunk)
+            decoded = time.perf_counter()
+            parser.feed(text)
+            decode += decoded - chunk_start
+            parse += time.perf_counter() - decoded
+            if parser.done:
+                break
+        else:
+            parser.feed(decoder.decode(b"", final=True))
+        self._add_timing("decode", decode)
+        self._add_timing("parse", parse)
+        if not parser.is_page:
+            raise SQCSessionExpired
+        self.page_results["parsed"] += 1
+        values = parser.values()
+        self._pages[key] = SQCCachedPage(fingerprint, etag, last_modified, values)
+        return values
@@ -1,18 +1,45 @@
 """Config flow for SQC integration."""
 from __future__ import annotations
 
+import ipaddress
 import logging
 import re
 from typing import Any
 
+import aiohttp
 import voluptuous as vol
 import asyncio
+from collections.abc import Mapping
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.data_entry_flow import AbortFlow
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import DOMAIN
+from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_ALARM_DEBOUNCE,
+    CONF_ALARM_FAST_POLL,
+    CONF_FILTER,
+    CONF_FILTER_WINDOW,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_SUBNET,
+    DEFAULT_ALARM_DEBOUNCE,
+    DEFAULT_ALARM_FAST_POLL,
+    DEFAULT_FILTER_WINDOW,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    FILTER_NONE,
+    FILTER_TYPES,
+    DOMAIN,
+    MAX_DISCOVERY_HOSTS,
+)
+
+from .discovery import SQCDiscoveredDevice, async_discover
+from .session import SQCAuthError, SQCSession
 
 from homeassistant.const import CONF_HOST, CONF_PIN
 
@@ -25,6 +52,12 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     }
 )
 
+STEP_REAUTH_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_PIN): str,
+    }
+)
+
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect.
@@ -54,31 +87,162 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     return {"title": f"SQC ({host})", "host": host, "pin": pin}
 
 
+def host_unique_id(host: str) -> str:
+    """Return the unique ID of the device at host, however it was written."""
+    return host.strip().lower().removeprefix("http://").removeprefix("https://").rstrip("/")
+
+
+async def validate_pin(hass: HomeAssistant, host: str, pin: str) -> None:
+    """Validate the PIN by logging in to the device."""
+    if not re.match(r'^\d{4}$', pin):
+        raise InvalidPin
+
+    session = SQCSession(async_get_clientsession(hass), host, pin)
+    try:
+        await session.async_login()
+    except SQCAuthError as err:
+        raise InvalidAuth from err
+    except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+        _LOGGER.error("Error connecting to %s: %s", host, err)
+        raise CannotConnect from err
+
+
+async def async_default_subnet(hass: HomeAssistant) -> str:
+    """Return the /24 network Home Assistant is in."""
+    try:
+        from homeassistant.components.network import async_get_source_ip
+
+        source_ip = await async_get_source_ip(hass)
+    except Exception:  # pylint: disable=broad-except
+        _LOGGER.debug("Could not determine the local network", exc_info=True)
+        return "192.168.1.0/24"
+    return str(ipaddress.ip_network(f"{source_ip}/24", strict=False))
+
+
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for SQC."""
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the flow."""
+        self._discovered: dict[str, SQCDiscoveredDevice] = {}
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ):
-        """Handle the initial step."""
+        """Let the user search the network or enter a host."""
+        return self.async_show_menu(step_id="user", menu_options=["discovery", "manual"])
+
+    async def async_step_discovery(
+        self, user_input: dict[str, Any] | None = None
+    ):
+        """Probe every address of a subnet for controllers."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            try:
+                network = ipaddress.IPv4Network(user_input[CONF_SUBNET], strict=False)
+            except ValueError:
+                errors[CONF_SUBNET] = "invalid_subnet"
+            else:
+                if network.num_addresses > MAX_DISCOVERY_HOSTS:
+                    errors[CONF_SUBNET] = "subnet_too_large"
+                else:
+                    configured = {
+                        host_unique_id(entry.data[CONF_HOST])
+                        for entry in self._async_current_entries()
+                    }
+                    self._discovered = {
+                        device.host: device
+                        for device in await async_discover(network)
+                        if host_unique_id(device.host) not in configured
+                    }
+                    if self._discovered:
+                        return await self.async_step_pick()
+                    errors["base"] = "no_devices_found"
+
+        subnet = (
+            user_input[CONF_SUBNET]
+            if user_input is not None
+            else await async_default_subnet(self.hass)
+        )
+        return self.async_show_form(
+            step_id="discovery",
+            data_schema=vol.Schema({vol.Required(CONF_SUBNET, default=subnet): str}),
+            errors=errors,
+        )
+
+    async def async_step_pick(
+        self, user_input: dict[str, Any] | None = None
+    ):
+        """Pick a discovered controller and log in to it."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            host = user_input[CONF_HOST]
+            try:
+                await validate_pin(self.hass, host, user_input[CONF_PIN])
+            except CannotConnect:
+                errors["base"] = "cannot_connect"
+            except InvalidPin:
+                errors["pin"] = "invalid_pin"
+            except InvalidAuth:
+                errors["pin"] = "invalid_auth"
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Unexpected exception")
+                errors["base"] = "unknown"
+            else:
+                await self._async_set_host_unique_id(host)
+                return self.async_create_entry(
+                    title=f"SQC ({host})",
+                    data={CONF_HOST: host, CONF_PIN: user_input[CONF_PIN]},
+                )
+
+        devices = {
+            host: f"{device.title} ({host.removeprefix('http://')})"
+            for host, device in self._discovered.items()
+        }
+        return self.async_show_form(
+            step_id="pick",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_HOST): vol.In(devices),
+                    vol.Required(CONF_PIN): str,
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_manual(
+        self, user_input: dict[str, Any] | None = None
+    ):
+        """Handle a host entered by hand."""
         errors: dict[str, str] = {}
         
         if user_input is not None:
             try:
                 info = await validate_input(self.hass, user_input)
+                await validate_pin(self.hass, info["host"], info["pin"])
             except CannotConnect:
                 errors["base"] = "cannot_connect"
             except InvalidPin:
                 errors["pin"] = "invalid_pin"
+            except InvalidAuth:
+                errors["pin"] = "invalid_auth"
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
             else:
-                # Create unique ID based on host
-                await self.async_set_unique_id(user_input[CONF_HOST])
-                self._abort_if_unique_id_configured()
+                await self._async_set_host_unique_id(info["host"])
                 
                 return self.async_create_entry(
                     title=info["title"], 
@@ -89,9 +253,111 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 )
 
         return self.async_show_form(
-            step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
+            step_id="manual", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
 
+    async def _async_set_host_unique_id(self, host: str) -> None:
+        """Abort if the device at host is configured, in any spelling."""
+        unique_id = host_unique_id(host)
+        await self.async_set_unique_id(unique_id)
+        self._abort_if_unique_id_configured()
+        # Entries created before unique IDs were normalized.
+        for entry in self._async_current_entries(include_ignore=False):
+            if host_unique_id(entry.data[CONF_HOST]) == unique_id:
+                raise AbortFlow("already_configured")
+
+    async def async_step_reauth(
+        self, entry_data: Mapping[str, Any]
+    ):
+        """Handle a PIN that the device no longer accepts."""
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ):
+        """Ask for a new PIN."""
+        errors: dict[str, str] = {}
+        entry = self._get_reauth_entry()
+
+        if user_input is not None:
+            try:
+                await validate_pin(self.hass, entry.data[CONF_HOST], user_input[CONF_PIN])
+            except CannotConnect:
+                errors["base"] = "cannot_connect"
+            except InvalidPin:
+                errors["pin"] = "invalid_pin"
+            except InvalidAuth:
+                errors["pin"] = "invalid_auth"
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Unexpected exception")
+                errors["base"] = "unknown"
+            else:
+                return self.async_update_reload_and_abort(
+                    entry, data_updates={CONF_PIN: user_input[CONF_PIN]}
+                )
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=STEP_REAUTH_DATA_SCHEMA,
+            description_placeholders={CONF_HOST: entry.data[CONF_HOST]},
+            errors=errors,
+        )
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle SQC options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ):
+        """Manage the polling and filter options."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            if user_input[CONF_MIN_SCAN_INTERVAL] > user_input[CONF_MAX_SCAN_INTERVAL]:
+                errors["base"] = "invalid_interval"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_ADAPTIVE_POLLING,
+                    default=options.get(CONF_ADAPTIVE_POLLING, False),
+                ): bool,
+                vol.Required(
+                    CONF_MIN_SCAN_INTERVAL,
+                    default=options.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Required(
+                    CONF_MAX_SCAN_INTERVAL,
+                    default=options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Required(
+                    CONF_FILTER,
+                    default=options.get(CONF_FILTER, FILTER_NONE),
+                ): vol.In(FILTER_TYPES),
+                vol.Required(
+                    CONF_FILTER_WINDOW,
+                    default=options.get(CONF_FILTER_WINDOW, DEFAULT_FILTER_WINDOW),
+                ): vol.All(vol.Coerce(int), vol.Range(min=3, max=15)),
+                vol.Required(
+                    CONF_ALARM_DEBOUNCE,
+                    default=options.get(CONF_ALARM_DEBOUNCE, DEFAULT_ALARM_DEBOUNCE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Required(
+                    CONF_ALARM_FAST_POLL,
+                    default=options.get(CONF_ALARM_FAST_POLL, DEFAULT_ALARM_FAST_POLL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Required(
+                    CONF_LONG_TERM_STATISTICS,
+                    default=options.get(CONF_LONG_TERM_STATISTICS, False),
+                ): bool,
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
+
 
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
@@ -99,3 +365,7 @@ class CannotConnect(HomeAssistantError):
 
 class InvalidPin(HomeAssistantError):
     """Error to indicate the PIN format is invalid."""
+
+
+class InvalidAuth(HomeAssistantError):
+    """Error to indicate the device rejected the PIN."""
@@ -1,6 +1,100 @@
 """Constants for the SQC integration."""
 
 DOMAIN = "ha-sqc"
+DATA_HUB = f"{DOMAIN}_hub"
 
 # Default values
-DEFAULT_SCAN_INTERVAL = 30
\ No newline at end of file
+DEFAULT_SCAN_INTERVAL = 30
+
+# Options
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+CONF_FILTER = "filter"
+CONF_FILTER_WINDOW = "filter_window"
+CONF_LONG_TERM_STATISTICS = "long_term_statistics"
+CONF_ALARM_DEBOUNCE = "alarm_debounce"
+CONF_ALARM_FAST_POLL = "alarm_fast_poll"
+
+DEFAULT_MIN_SCAN_INTERVAL = 5
+DEFAULT_MAX_SCAN_INTERVAL = 300
+
+# Spike filters for noisy probes
+FILTER_NONE = "none"
+FILTER_TYPES = [FILTER_NONE, "median", "hampel"]
+# Filtered fields and the resolution the device shows them in
+FILTERED_FIELDS = {"ph": 0.01, "co2": 0.1}
+DEFAULT_FILTER_WINDOW = 5
+
+# Fields parsed regardless of the enabled entities
+REQUIRED_FIELDS = {"title", "alarm"}
+
+# Alarm states shown by the device
+EVENT_ALARM = f"{DOMAIN}_alarm"
+DEFAULT_ALARM_DEBOUNCE = 0
+DEFAULT_ALARM_FAST_POLL = 0
+ALARM_NONE = "brak"
+ALARM_STATES = [
+    "brak",
+    "brak sondy ph",
+    "błąd konfiguracji alarmów ph",
+    "ph za niskie",
+    "ph za wysokie",
+    "brak sondy temperatury",
+    "temperatura za niska",
+    "temperatura za wysoka",
+    "błąd konfiguracji alarmów temperatury",
+]
+
+# Adaptive polling
+ADAPTIVE_POLLING_FIELDS = {"alarm", "ph", "co2"}
+BACKOFF_FACTOR = 1.5
+PH_RATE_THRESHOLD = 0.1  # pH per minute
+CO2_RATE_THRESHOLD = 2.0  # ppm per minute
+
+# Circuit breaker
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_BASE_DELAY = 60
+BREAKER_MAX_DELAY = 1800
+PROBE_CONNECT_TIMEOUT = 3
+
+# Page streaming
+CHUNK_SIZE = 1024
+KEEPALIVE_TIMEOUT = 120
+
+# Session
+LOGIN_RETRIES = 2
+AUTH_FAILURE_LIMIT = 3
+
+# Hub
+MAX_CONCURRENT_POLLS = 8
+FLEET_SIGNAL = f"{DOMAIN}_fleet"
+
+# Discovery
+CONF_SUBNET = "subnet"
+DISCOVERY_CONCURRENCY = 64
+DISCOVERY_CONNECT_TIMEOUT = 1
+DISCOVERY_TIMEOUT = 3
+MAX_DISCOVERY_HOSTS = 1024
+
+# Diagnostics
+POLL_STATS_WINDOW = 100
+
+# Rolling statistics of recent readings
+HISTORY_FIELDS = ("temperature", "ph", "co2")
+HISTORY_WINDOW = 600
+HISTORY_SIZE = 256
+
+# Storage
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60
+
+# Long-term statistics, the source must be a valid domain without hyphens
+STATISTICS_SOURCE = "ha_sqc"
+STATISTICS_FIELDS = {"temperature", "ph", "co2", "co2_counter"}
+
+# Services
+SERVICE_GET_SNAPSHOT = "get_snapshot"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_MAX_AGE = "max_age"
+DEFAULT_MAX_AGE = 60
\ No newline at end of file
@@ -3,114 +3,472 @@ from __future__ import annotations
 
 import asyncio
 import aiohttp
+import dataclasses
 import logging
-import re
-from datetime import timedelta
-from typing import Any
+import time
+from collections import Counter
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.storage import Store
 
 from homeassistant.const import CONF_HOST, CONF_PIN
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, DEFAULT_SCAN_INTERVAL
+from .const import (
+    ADAPTIVE_POLLING_FIELDS,
+    ALARM_NONE,
+    AUTH_FAILURE_LIMIT,
+    BACKOFF_FACTOR,
+    BREAKER_BASE_DELAY,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_DELAY,
+    CO2_RATE_THRESHOLD,
+    CONF_ADAPTIVE_POLLING,
+    CONF_ALARM_DEBOUNCE,
+    CONF_ALARM_FAST_POLL,
+    CONF_FILTER,
+    CONF_FILTER_WINDOW,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    DEFAULT_ALARM_DEBOUNCE,
+    DEFAULT_ALARM_FAST_POLL,
+    DEFAULT_FILTER_WINDOW,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    EVENT_ALARM,
+    FILTER_NONE,
+    FILTERED_FIELDS,
+    HISTORY_FIELDS,
+    HISTORY_SIZE,
+    HISTORY_WINDOW,
+    PH_RATE_THRESHOLD,
+    POLL_STATS_WINDOW,
+    PROBE_CONNECT_TIMEOUT,
+    REQUIRED_FIELDS,
+    STATISTICS_FIELDS,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .breaker import BreakerState, CircuitBreaker
+from .client import SQCClient
+from .filters import FILTERS, MedianFilter
+from .history import RollingSeries
+from .models import SQCSnapshot
+from .session import SQCAuthError, SQCSessionExpired
+from .timing import FAN_OUT, POLL_PHASES, PollStats
 
-from types import MappingProxyType
-
-from aiohttp.http_exceptions import BadHttpMessage
+if TYPE_CHECKING:
+    from .hub import SQCHub
+    from .long_term import SQCStatistics
 
+_LOGGER = logging.getLogger(__name__)
 
 
-_LOGGER = logging.getLogger(__name__)
+def storage_key(entry_id: str) -> str:
+    """Return the storage key of a config entry."""
+    return f"{DOMAIN}.{entry_id}"
 
 
-class SQCDataUpdateCoordinator(DataUpdateCoordinator):
+class SQCDataUpdateCoordinator(DataUpdateCoordinator[SQCSnapshot]):
     """Class to manage fetching data from the API."""
 
     def __init__(
         self,
         hass: HomeAssistant,
-        config: MappingProxyType[str, Any],
+        config_entry: ConfigEntry,
+        hub: SQCHub,
     ) -> None:
         """Initialize."""
-        self.host = config[CONF_HOST]
-        self.pin = config[CONF_PIN]
+        self.hub = hub
+        self.host = config_entry.data[CONF_HOST]
+        self.pin = config_entry.data[CONF_PIN]
+
+        options = config_entry.options
+        self.adaptive_polling: bool = options.get(CONF_ADAPTIVE_POLLING, False)
+        self.min_interval = timedelta(
+            seconds=options.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL)
+        )
+        self.max_interval = timedelta(
+            seconds=options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL)
+        )
+        self._last_poll: float | None = None
+        self._poll_interval = timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+
+        # Alarm transitions fire EVENT_ALARM once the new state lasted for
+        # the debounce time, optionally followed by a window of fast polls.
+        self.alarm_debounce: float = options.get(CONF_ALARM_DEBOUNCE, DEFAULT_ALARM_DEBOUNCE)
+        self.alarm_fast_poll: float = options.get(CONF_ALARM_FAST_POLL, DEFAULT_ALARM_FAST_POLL)
+        self._alarm: str | None = None
+        self._alarm_candidate: str | None = None
+        self._alarm_candidate_since = 0.0
+        self._fast_poll_until: float | None = None
+
+        filter_type = options.get(CONF_FILTER, FILTER_NONE)
+        window = options.get(CONF_FILTER_WINDOW, DEFAULT_FILTER_WINDOW)
+        self.filters: dict[str, MedianFilter] = (
+            {}
+            if filter_type == FILTER_NONE
+            else {
+                field: FILTERS[filter_type](window, resolution)
+                for field, resolution in FILTERED_FIELDS.items()
+            }
+        )
+        # Unfiltered readings of the last poll.
+        self.raw: dict[str, float] = {}
+        # Set up by the integration when long-term statistics are enabled.
+        self.statistics: SQCStatistics | None = None
+
+        self.breaker = CircuitBreaker(
+            BREAKER_FAILURE_THRESHOLD, BREAKER_BASE_DELAY, BREAKER_MAX_DELAY
+        )
+        self.next_probe: datetime | None = None
+        self.poll_latency: float | None = None
+        self.stats = PollStats(POLL_STATS_WINDOW)
+        self._timings: dict[str, float] = {}
+        self.poll_signal = f"{DOMAIN}_{config_entry.entry_id}_poll"
+        self.history = {
+            field: RollingSeries(HISTORY_SIZE, HISTORY_WINDOW) for field in HISTORY_FIELDS
+        }
+
+        self.client = SQCClient(self.host, self.pin)
+        self._refresh_task: asyncio.Task[SQCSnapshot] | None = None
+        self._auth_failures = 0
 
-        self.session = async_get_clientsession(hass)
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, storage_key(config_entry.entry_id)
+        )
+        self.stale = False
+        self.last_update: datetime | None = None
         
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=config_entry,
             name=DOMAIN,
-            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            # Polls are scheduled by the hub, see poll_interval.
+            update_interval=None,
+            # Snapshots compare by value, so an unchanged page notifies nobody.
+            always_update=False,
         )
+
+        self.device_title: str | None = None
+        self._device_info = self._build_device_info()
+
+        # Fields used by enabled entities; everything is parsed until the
+        # platforms have been set up and the entities registered.
+        self._field_users: Counter[str] = Counter()
+        self._track_fields = False
     
-    async def _login(self) -> None:
-        """Login to the SQC API with pin"""
-
-        url = f"{self.host}"
-        async with self.session.post(url, data={"pin": self.pin}, timeout=aiohttp.ClientTimeout(total=10)) as res:
-            if res.status == 200:
-                text = await res.text()
-                if "PIN prawidłowy" in text:
-                    _LOGGER.info("Login successful")
-                    await asyncio.sleep(1)
-                else:
-                    text = await res.text()
-                    raise UpdateFailed(f"Login failed: {text}")
-        
-    def _get_device_name(self) -> str:
-        """Extract device name from HTML."""
-        if self.data is not None:
-            html = self.data.get("html")
-            if html is not None:
-                pattern = r"<title>(.+)</title>"
-                match = re.search(pattern, html)
-                if match:
-                    return match.group(1)
-        return "Unknown Device"
-    
-    def _get_device_info(self, entry_id) -> DeviceInfo:
-        device_name = self._get_device_name()
+    @property
+    def fields(self) -> set[str] | None:
+        """Return the fields to parse, or None for all of them."""
+        if not self._track_fields:
+            return None
+        fields = set(self._field_users) | REQUIRED_FIELDS
+        if self.adaptive_polling:
+            fields |= ADAPTIVE_POLLING_FIELDS
+        if self.statistics is not None:
+            fields |= STATISTICS_FIELDS
+        return fields
+
+    @callback
+    def async_track_fields(self) -> None:
+        """Parse only the fields of registered entities from now on."""
+        self._track_fields = True
+        _LOGGER.debug("Parsing %s from %s", sorted(self.fields or ()), self.host)
+
+    @callback
+    def async_add_field(self, field: str) -> Callable[[], None]:
+        """Register an entity that needs field, return a callback to remove it."""
+        self._field_users[field] += 1
+
+        @callback
+        def _remove_field() -> None:
+            self._field_users[field] -= 1
+            if not self._field_users[field]:
+                del self._field_users[field]
+
+        return _remove_field
+
+    async def async_load_cached(self) -> bool:
+        """Serve the snapshot saved before the last restart, if there is one."""
+        if (stored := await self._store.async_load()) is None:
+            return False
+        try:
+            self.data = SQCSnapshot.from_dict(stored["snapshot"])
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring cached snapshot of %s: %s", self.host, err)
+            return False
+        self.stale = True
+        # An alarm that changed while Home Assistant was down still fires.
+        self._alarm = self.data.alarm
+        self._async_set_device_title(self.data.title)
+        return True
+
+    @callback
+    def _data_to_store(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {"snapshot": self.data.as_dict() if self.data is not None else None}
+
+    @property
+    def poll_interval(self) -> timedelta:
+        """Return the time until this device should be polled again."""
+        if self.breaker.state is BreakerState.OPEN:
+            return timedelta(seconds=self.breaker.delay)
+        if self._fast_poll_until is not None:
+            if self.hass.loop.time() < self._fast_poll_until:
+                return min(self.min_interval, self._poll_interval)
+            self._fast_poll_until = None
+        return self._poll_interval
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners and time the fan-out."""
+        start = time.perf_counter()
+        self.hub.async_update_fleet(self.config_entry.entry_id, self)
+        super().async_update_listeners()
+        self.stats.add(FAN_OUT, time.perf_counter() - start)
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device info shared by all entities of this device."""
+        return self._device_info
+
+    def _build_device_info(self) -> DeviceInfo:
+        device_name = self.device_title or "Unknown Device"
         return { 
-            "identifiers": {(DOMAIN, entry_id)},
+            "identifiers": {(DOMAIN, self.config_entry.entry_id)},
             "name": device_name,
             "manufacturer": "SeaQuaComp",
             "model": device_name,
         }
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        url = f"{self.host}/home"
+    @callback
+    def _async_set_device_title(self, title: str | None) -> None:
+        """Cache the device title and update a registered device."""
+        if title is None or title == self.device_title:
+            return
+        self.device_title = title
+        self._device_info = self._build_device_info()
+
+        device_registry = dr.async_get(self.hass)
+        device = device_registry.async_get_device(
+            identifiers={(DOMAIN, self.config_entry.entry_id)}
+        )
+        if device is not None:
+            _LOGGER.debug("Renaming device %s to %s", self.host, title)
+            device_registry.async_update_device(device.id, name=title, model=title)
+
+    def _is_active(self, snapshot: SQCSnapshot, elapsed: float) -> bool:
+        """Return True if the tank needs close watching."""
+        if snapshot.alarm is not None and snapshot.alarm != ALARM_NONE:
+            return True
+        if self.data is None or elapsed <= 0:
+            return False
+        for new, old, threshold in (
+            (snapshot.ph, self.data.ph, PH_RATE_THRESHOLD),
+            (snapshot.co2, self.data.co2, CO2_RATE_THRESHOLD),
+        ):
+            if new is not None and old is not None:
+                if abs(new - old) / elapsed * 60 >= threshold:
+                    return True
+        return False
+
+    def _adapt_interval(self, snapshot: SQCSnapshot) -> None:
+        """Poll fast while the tank is changing and back off when stable."""
+        now = self.hass.loop.time()
+        elapsed = now - self._last_poll if self._last_poll is not None else 0.0
+        self._last_poll = now
+
+        if self._is_active(snapshot, elapsed):
+            interval = self.min_interval
+        else:
+            interval = min(self._poll_interval * BACKOFF_FACTOR, self.max_interval)
+        if interval != self._poll_interval:
+            _LOGGER.debug("Polling %s every %s", self.host, interval)
+            self._poll_interval = interval
+
+    @callback
+    def _async_check_alarm(self, snapshot: SQCSnapshot) -> None:
+        """Fire EVENT_ALARM when the alarm changed and the change lasted."""
+        if (alarm := snapshot.alarm) is None:
+            return
+        if self._alarm is None:
+            self._alarm = alarm
+            return
+        if alarm == self._alarm:
+            # Flapped back before the debounce time passed.
+            self._alarm_candidate = None
+            return
+        now = self.hass.loop.time()
+        if alarm != self._alarm_candidate:
+            self._alarm_candidate = alarm
+            self._alarm_candidate_since = now
+        if now - self._alarm_candidate_since < self.alarm_debounce:
+            return
+
+        old, self._alarm = self._alarm, alarm
+        self._alarm_candidate = None
+        _LOGGER.debug("Alarm of %s changed from %s to %s", self.host, old, alarm)
+        self.hass.bus.async_fire(
+            EVENT_ALARM,
+            {
+                "config_entry_id": self.config_entry.entry_id,
+                "host": self.host,
+                "title": self.device_title,
+                "old_state": old,
+                "new_state": alarm,
+                "active": alarm != ALARM_NONE,
+                "readings": snapshot.as_dict(),
+            },
+        )
+        if self.alarm_fast_poll:
+            self._fast_poll_until = now + self.alarm_fast_poll
+
+    def _apply_filters(self, snapshot: SQCSnapshot) -> SQCSnapshot:
+        """Replace spikes in noisy readings, keeping the raw values."""
+        if not self.filters:
+            return snapshot
+        enabled = self.fields
+        filtered: dict[str, float] = {}
+        for field, value_filter in self.filters.items():
+            if enabled is not None and field not in enabled:
+                continue
+            if (value := getattr(snapshot, field)) is not None:
+                self.raw[field] = value
+                filtered[field] = value_filter.update(value)
+        return dataclasses.replace(snapshot, **filtered)
+
+    def _record_history(self, snapshot: SQCSnapshot) -> None:
+        """Add the readings of a poll to the rolling statistics."""
+        now = self.hass.loop.time()
+        enabled = self.fields
+        for field, series in self.history.items():
+            # Fields that are not parsed keep their last value in the snapshot.
+            if enabled is not None and field not in enabled:
+                continue
+            if (value := getattr(snapshot, field)) is not None:
+                series.add(now, value)
+            else:
+                series.expire(now)
+
+    def _record_failure(self) -> None:
+        """Feed a failed poll to the circuit breaker."""
+        previous = self.breaker.state
+        self.breaker.record_failure(self.hass.loop.time())
+        if self.breaker.state is BreakerState.OPEN:
+            self.next_probe = dt_util.utcnow() + timedelta(seconds=self.breaker.delay)
+            if previous is BreakerState.CLOSED:
+                _LOGGER.warning(
+                    "%s failed %d times in a row, probing every %ds",
+                    self.host,
+                    self.breaker.failures,
+                    self.breaker.delay,
+                )
+        if self.breaker.state is not previous:
+            # Failed polls in a row do not notify listeners on their own.
+            self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        """Stop refreshing and close the connection to the device."""
+        await super().async_shutdown()
+        await self.client.async_close()
+
+    async def _async_update_data(self) -> SQCSnapshot:
+        # Overlapping refreshes, for example a manual one during a scheduled
+        # poll, share the fetch in flight instead of sending another request.
+        if (task := self._refresh_task) is None:
+            task = self.hass.async_create_task(
+                self._async_poll_device(), f"{DOMAIN} poll {self.host}"
+            )
+            if not task.done():
+                self._refresh_task = task
+                task.add_done_callback(self._async_clear_refresh_task)
+        return await asyncio.shield(task)
+
+    @callback
+    def _async_clear_refresh_task(self, _task: asyncio.Task[SQCSnapshot]) -> None:
+        """Let the next refresh fetch again."""
+        self._refresh_task = None
+
+    async def _async_poll_device(self) -> SQCSnapshot:
+        """Fetch a new snapshot and feed the outcome to the breaker."""
+        if not self.breaker.allow_request(self.hass.loop.time()):
+            raise UpdateFailed(f"Host {self.host} is unreachable, next probe at {self.next_probe}")
+
+        probing = self.breaker.state is BreakerState.HALF_OPEN
+        try:
+            async with self.hub.async_slot(self.host):
+                self._timings = self.client.timings = dict.fromkeys(POLL_PHASES, 0.0)
+                start = time.perf_counter()
+                success = False
+                try:
+                    snapshot = self._apply_filters(
+                        await self._async_fetch_snapshot(probing)
+                    )
+                    self._record_history(snapshot)
+                    success = True
+                finally:
+                    self.poll_latency = self._timings["total"] = time.perf_counter() - start
+                    self.stats.record(self._timings, success)
+                    async_dispatcher_send(self.hass, self.poll_signal)
+        except UpdateFailed:
+            self._record_failure()
+            raise
+
+        if probing:
+            _LOGGER.info("%s is reachable again", self.host)
+        self.breaker.record_success()
+        self.next_probe = None
+        self.last_update = dt_util.utcnow()
+        if self.adaptive_polling:
+            self._adapt_interval(snapshot)
+        self._async_check_alarm(snapshot)
+        self._async_set_device_title(snapshot.title)
+        if self.statistics is not None:
+            self.statistics.record(snapshot, dt_util.utcnow())
+        if snapshot != self.data:
+            self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+        if self.stale:
+            self.stale = False
+            # An unchanged snapshot would not notify the entities otherwise.
+            self.async_update_listeners()
+        return snapshot
+
+    async def _async_fetch_snapshot(self, probing: bool = False) -> SQCSnapshot:
+        # A probe gives up quickly on a host that does not accept connections.
+        timeout = aiohttp.ClientTimeout(
+            total=10, sock_connect=PROBE_CONNECT_TIMEOUT if probing else None
+        )
         try:
-            async with self.session.get(
-                url, timeout=aiohttp.ClientTimeout(total=10)
-            ) as resp:
-                if resp.status != 200:
-                    raise UpdateFailed(f"Bad status {resp.status}")
-
-                data = await resp.text()
-                if "<!DOCTYPE html>" not in data:
-                    raise BadHttpMessage("Not logged in")
-
-                return {
-                    "html": data,
-                    "online": True,
-                    "last_updated": self.hass.loop.time(),
-                }
-        except BadHttpMessage as err:
-            _LOGGER.warning("Not logged in, trying to login")
-            await self._login()
-            return await self._async_update_data()
+            snapshot = await self.client.async_fetch_snapshot(self.fields, timeout)
+        except SQCAuthError as err:
+            self._auth_failures += 1
+            # Without a snapshot this is the first refresh of the setup, and
+            # a retried setup starts a new coordinator and a new count.
+            if self.data is None or self._auth_failures >= AUTH_FAILURE_LIMIT:
+                raise ConfigEntryAuthFailed(str(err)) from err
+            raise UpdateFailed(str(err)) from err
+        except SQCSessionExpired as err:
+            raise UpdateFailed(str(err)) from err
         except aiohttp.ClientConnectorError as err:
             # host całkowicie niedostępny (np. odłączony od prądu)
             raise UpdateFailed(f"Host {self.host} not reachable: {err}") from err
         except asyncio.TimeoutError:
             raise UpdateFailed(f"Timeout while fetching from {self.host}")
         except aiohttp.ClientError as err:
-            if "Expected HTTP/" in str(err):
-                _LOGGER.warning("Not logged in, trying to login")
-                await self._login()
-                return await self._async_update_data()
-            raise UpdateFailed(f"Comm error with {self.host}: {err}") from err
\ No newline at end of file
+            raise UpdateFailed(f"Comm error with {self.host}: {err}") from err
+
+        self._auth_failures = 0
+        return snapshot
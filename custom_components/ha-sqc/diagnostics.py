@@ -0,0 +1,41 @@
+"""Diagnostics support for SQC."""
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PIN
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import SQCDataUpdateCoordinator
+
+TO_REDACT = {CONF_PIN}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: SQCDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "snapshot": asdict(coordinator.data) if coordinator.data is not None else None,
+        "last_update_success": coordinator.last_update_success,
+        "poll_interval": coordinator.poll_interval.total_seconds(),
+        "breaker": {
+            "state": coordinator.breaker.state,
+            "failures": coordinator.breaker.failures,
+            "next_probe": coordinator.next_probe,
+        },
+        "session": {
+            "logins": coordinator.client.sqc_session.login_count,
+            "lifetime": coordinator.client.sqc_session.lifetime,
+        },
+        "connections": dict(coordinator.client.connections),
+        "pages": dict(coordinator.client.page_results),
+        "polls": coordinator.stats.as_dict(),
+    }
@@ -0,0 +1,121 @@
+"""Find SQC controllers on the local network."""
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+import re
+from dataclasses import dataclass
+
+import aiohttp
+from aiohttp.http_exceptions import BadHttpMessage
+
+from .const import (
+    DISCOVERY_CONCURRENCY,
+    DISCOVERY_CONNECT_TIMEOUT,
+    DISCOVERY_TIMEOUT,
+)
+from .parser import SQCPageParser
+
+_LOGGER = logging.getLogger(__name__)
+
+# The login page is small; more than this is not an SQC.
+MAX_LOGIN_PAGE = 16384
+# The readings are near the top of the home page.
+MAX_HOME_PAGE = 65536
+# Readings that only an SQC home page shows.
+HOME_FIELDS = frozenset({"temperature", "ph"})
+
+# A device shows a form asking for the PIN on its start page.
+PIN_FORM_PATTERN = re.compile(r"""name\s*=\s*["']?pin\b""", re.IGNORECASE)
+TITLE_PATTERN = re.compile(r"<title>\s*([^<]*?)\s*</title>", re.IGNORECASE)
+
+
+@dataclass(frozen=True, slots=True)
+class SQCDiscoveredDevice:
+    """A controller that answered a discovery probe."""
+
+    host: str
+    title: str
+
+
+def parse_login_page(host: str, html: str) -> SQCDiscoveredDevice | None:
+    """Return the device if html is the login page of an SQC."""
+    if PIN_FORM_PATTERN.search(html) is None:
+        return None
+    if (title := TITLE_PATTERN.search(html)) is None:
+        return None
+    return SQCDiscoveredDevice(host, title.group(1) or host)
+
+
+def _timeout() -> aiohttp.ClientTimeout:
+    """Return the timeout of one probe request."""
+    return aiohttp.ClientTimeout(total=DISCOVERY_TIMEOUT, sock_connect=DISCOVERY_CONNECT_TIMEOUT)
+
+
+async def async_probe(
+    session: aiohttp.ClientSession, address: str
+) -> SQCDiscoveredDevice | None:
+    """Return the device at address if it is an SQC."""
+    host = f"http://{address}"
+    try:
+        async with session.get(host, timeout=_timeout(), allow_redirects=False) as resp:
+            if resp.status != 200:
+                return None
+            body = await resp.content.read(MAX_LOGIN_PAGE)
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+        return None
+    if (device := parse_login_page(host, body.decode("utf-8", errors="replace"))) is None:
+        return None
+    # Routers and printers ask for PINs too; only the home page tells.
+    if not await async_probe_home_page(session, host):
+        _LOGGER.debug("%s asks for a PIN but is not an SQC", host)
+        return None
+    return device
+
+
+async def async_probe_home_page(session: aiohttp.ClientSession, host: str) -> bool:
+    """Return True if the home page at host answers like an SQC.
+
+    Without a login session an SQC answers with bytes that are not HTTP,
+    the same answer that tells the client its session expired. With one,
+    it shows the readings.
+    """
+    try:
+        async with session.get(
+            f"{host}/home", timeout=_timeout(), allow_redirects=False
+        ) as resp:
+            if resp.status != 200:
+                return False
+            body = await resp.content.read(MAX_HOME_PAGE)
+    except BadHttpMessage:
+        return True
+    except aiohttp.ClientError as err:
+        return "Expected HTTP/" in str(err)
+    except (asyncio.TimeoutError, ValueError):
+        return False
+    parser = SQCPageParser(HOME_FIELDS)
+    parser.feed(body.decode("utf-8", errors="replace"))
+    return parser.done
+
+
+async def async_discover(
+    network: ipaddress.IPv4Network,
+) -> list[SQCDiscoveredDevice]:
+    """Probe every address of network, a few dozen at a time."""
+    semaphore = asyncio.Semaphore(DISCOVERY_CONCURRENCY)
+    # A session of its own, so the probes do not queue behind the shared
+    # connection pool, and no connection is kept to hosts that are not SQCs.
+    connector = aiohttp.TCPConnector(limit=DISCOVERY_CONCURRENCY, force_close=True)
+
+    async with aiohttp.ClientSession(connector=connector) as session:
+
+        async def _async_probe(address: ipaddress.IPv4Address) -> SQCDiscoveredDevice | None:
+            async with semaphore:
+                return await async_probe(session, str(address))
+
+        results = await asyncio.gather(*(_async_probe(address) for address in network.hosts()))
+
+    devices = [device for device in results if device is not None]
+    _LOGGER.debug("Found %d SQC controllers in %s", len(devices), network)
+    return devices
@@ -0,0 +1,64 @@
+"""Base entity for SQC integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import SQCDataUpdateCoordinator
+
+
+class SQCEntity(CoordinatorEntity[SQCDataUpdateCoordinator]):
+    """Base class for SQC entities."""
+
+    # Page field this entity shows, parsed only while the entity is enabled.
+    _field: str | None = None
+
+    def __init__(
+        self,
+        coordinator: SQCDataUpdateCoordinator,
+        config_entry: ConfigEntry,
+        sensor_key: str,
+        name: str,
+    ) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self._sensor_key = sensor_key
+        self._attr_name = name
+        self._attr_unique_id = f"{config_entry.entry_id}_{sensor_key}"
+        self._attr_device_info = self.coordinator.device_info
+        self._written_state: tuple[Any, ...] | None = None
+
+    @property
+    def available(self) -> bool:
+        """Return True if the entity is available."""
+        return self.coordinator.last_update_success and self.coordinator.data is not None
+
+    async def async_added_to_hass(self) -> None:
+        """Register the field and remember the state written when added."""
+        await super().async_added_to_hass()
+        if self._field is not None:
+            self.async_on_remove(self.coordinator.async_add_field(self._field))
+        self._written_state = self._state_key()
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Flag values restored from before a restart."""
+        if self.coordinator.stale:
+            return {"stale": True}
+        return None
+
+    def _state_key(self) -> tuple[Any, ...]:
+        """Return everything that ends up in this entity's state."""
+        return (self.available, self.coordinator.stale)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when this entity's own values changed."""
+        state = self._state_key()
+        if state == self._written_state:
+            return
+        self._written_state = state
+        self.async_write_ha_state()
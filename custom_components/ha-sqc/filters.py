@@ -0,0 +1,89 @@
+"""Filters against spikes in noisy SQC probe readings."""
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections import deque
+
+# Scale of the median absolute deviation to the standard deviation of
+# normally distributed values.
+MAD_SCALE = 1.4826
+
+
+class MedianFilter:
+    """Median of the last window samples.
+
+    The window is kept sorted next to the samples in arrival order, so each
+    sample costs a binary search and a short list move. The resolution is
+    the smallest step the device shows the readings in.
+    """
+
+    def __init__(self, window: int, resolution: float = 0.0) -> None:
+        """Initialize the filter."""
+        self._samples: deque[float] = deque()
+        self._sorted: list[float] = []
+        self.window = window
+        self.resolution = resolution
+
+    @property
+    def median(self) -> float:
+        """Return the median of the window."""
+        count = len(self._sorted)
+        middle = count // 2
+        if count % 2:
+            return self._sorted[middle]
+        return (self._sorted[middle - 1] + self._sorted[middle]) / 2
+
+    def _add(self, value: float) -> None:
+        """Add a sample to the window."""
+        if len(self._samples) == self.window:
+            del self._sorted[bisect_left(self._sorted, self._samples.popleft())]
+        self._samples.append(value)
+        insort(self._sorted, value)
+
+    def update(self, value: float) -> float:
+        """Add a sample and return the filtered value."""
+        self._add(value)
+        return self.median
+
+
+class HampelFilter(MedianFilter):
+    """Replace samples far from the median of the window by that median.
+
+    Unlike the median filter, readings that agree with their neighbours
+    pass unchanged, so only spikes are hidden. The deviation of the window
+    is recomputed per sample, which is cheap for the short windows used.
+
+    Rounded readings of a steady probe are often all equal, which makes the
+    deviation 0 and any step an outlier. The deviation is therefore never
+    taken below the resolution, and without one a window that does not
+    deviate at all replaces nothing.
+    """
+
+    def __init__(
+        self, window: int, resolution: float = 0.0, threshold: float = 3.0
+    ) -> None:
+        """Initialize the filter."""
+        super().__init__(window, resolution)
+        self.threshold = threshold
+
+    def update(self, value: float) -> float:
+        """Add a sample and return it, or the median if it is an outlier."""
+        self._add(value)
+        median = self.median
+        deviations = sorted(abs(sample - median) for sample in self._sorted)
+        count = len(deviations)
+        mad = (
+            deviations[count // 2]
+            if count % 2
+            else (deviations[count // 2 - 1] + deviations[count // 2]) / 2
+        )
+        mad = max(mad, self.resolution)
+        if mad and abs(value - median) > self.threshold * MAD_SCALE * mad:
+            return median
+        return value
+
+
+FILTERS: dict[str, type[MedianFilter]] = {
+    "median": MedianFilter,
+    "hampel": HampelFilter,
+}
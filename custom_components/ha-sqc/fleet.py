@@ -0,0 +1,112 @@
+"""Aggregates of the readings of every SQC controller."""
+from __future__ import annotations
+
+import heapq
+
+from .const import ALARM_NONE
+from .models import SQCSnapshot
+
+FLEET_FIELDS = ("temperature", "ph", "co2")
+
+
+class FleetReading:
+    """Minimum, maximum and mean of one reading over all devices.
+
+    The sum is updated with the difference of the changed device, and the
+    extremes come from heaps whose outdated entries are dropped when they
+    reach the top, so an update costs O(log n) instead of a pass over all
+    devices.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the reading."""
+        self._values: dict[str, float] = {}
+        self._total = 0.0
+        self._min: list[tuple[float, str]] = []
+        self._max: list[tuple[float, str]] = []
+
+    def set(self, device: str, value: float | None) -> None:
+        """Set the value of a device, None removes it."""
+        if (old := self._values.pop(device, None)) is not None:
+            self._total -= old
+        if value is not None:
+            self._values[device] = value
+            self._total += value
+            heapq.heappush(self._min, (value, device))
+            heapq.heappush(self._max, (-value, device))
+        if len(self._min) + len(self._max) > 4 * len(self._values) + 32:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        """Drop every outdated heap entry and the rounding error of the sum."""
+        self._min = [(value, device) for device, value in self._values.items()]
+        self._max = [(-value, device) for device, value in self._values.items()]
+        heapq.heapify(self._min)
+        heapq.heapify(self._max)
+        self._total = sum(self._values.values())
+
+    def _current(self, heap: list[tuple[float, str]], sign: float) -> float | None:
+        """Return the top of heap after dropping outdated entries."""
+        while heap:
+            value, device = heap[0]
+            if self._values.get(device) == value * sign:
+                return value * sign
+            heapq.heappop(heap)
+        return None
+
+    @property
+    def count(self) -> int:
+        """Return the number of devices with a value."""
+        return len(self._values)
+
+    @property
+    def minimum(self) -> float | None:
+        """Return the lowest value."""
+        return self._current(self._min, 1.0)
+
+    @property
+    def maximum(self) -> float | None:
+        """Return the highest value."""
+        return self._current(self._max, -1.0)
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean value."""
+        if not self._values:
+            return None
+        return self._total / len(self._values)
+
+
+class SQCFleet:
+    """Readings, alarms and availability of all devices."""
+
+    def __init__(self) -> None:
+        """Initialize the fleet."""
+        self.readings = {field: FleetReading() for field in FLEET_FIELDS}
+        self.devices: set[str] = set()
+        self.in_alarm: set[str] = set()
+        self.offline: set[str] = set()
+
+    def update(self, device: str, snapshot: SQCSnapshot | None, online: bool) -> None:
+        """Replace what is known about one device."""
+        self.devices.add(device)
+        if online:
+            self.offline.discard(device)
+        else:
+            self.offline.add(device)
+        # Readings of an offline device are outdated, they are left out.
+        current = snapshot if online else None
+        for field, reading in self.readings.items():
+            reading.set(device, getattr(current, field) if current is not None else None)
+        if current is not None and current.alarm is not None and current.alarm != ALARM_NONE:
+            self.in_alarm.add(device)
+        else:
+            self.in_alarm.discard(device)
+
+    def remove(self, device: str) -> None:
+        """Forget a device."""
+        self.devices.discard(device)
+        self.offline.discard(device)
+        self.in_alarm.discard(device)
+        for reading in self.readings.values():
+            reading.set(device, None)
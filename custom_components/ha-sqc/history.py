@@ -0,0 +1,153 @@
+"""Recent readings of SQC with rolling statistics."""
+from __future__ import annotations
+
+import math
+from array import array
+from collections import deque
+
+
+class RollingSeries:
+    """Samples of one reading from the last window seconds.
+
+    Samples live in fixed size arrays used as a ring buffer, so memory is
+    bounded by size. Sums for the mean, variance and least squares slope
+    are kept up to date as samples are added and expire, and minimum and
+    maximum come from monotonic queues, so every sample costs O(1).
+    """
+
+    def __init__(self, size: int, window: float) -> None:
+        """Initialize the series."""
+        self.size = size
+        self.window = window
+        self._times = array("d", bytes(8 * size))
+        self._values = array("d", bytes(8 * size))
+        # Sequence numbers of the oldest and the next sample; the ring index
+        # of a sample is its sequence number modulo size.
+        self._first = 0
+        self._next = 0
+        # Times are stored relative to _base so the sums keep their precision.
+        self._base = 0.0
+        self._clear_sums()
+        self._removed = 0
+        # (sequence number, value), increasing for _min and decreasing for _max.
+        self._min: deque[tuple[int, float]] = deque()
+        self._max: deque[tuple[int, float]] = deque()
+
+    def __len__(self) -> int:
+        """Return the number of samples in the window."""
+        return self._next - self._first
+
+    def add(self, when: float, value: float) -> None:
+        """Add a sample taken at the monotonic time when."""
+        if not self:
+            self._base = when
+            self._clear_sums()
+        if len(self) == self.size:
+            self._remove_oldest()
+        index = self._next % self.size
+        t = when - self._base
+        self._times[index] = t
+        self._values[index] = value
+        self._sum_t += t
+        self._sum_v += value
+        self._sum_tt += t * t
+        self._sum_tv += t * value
+        self._sum_vv += value * value
+
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((self._next, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((self._next, value))
+        self._next += 1
+        self.expire(when)
+
+    def expire(self, now: float) -> None:
+        """Drop the samples that left the window."""
+        cutoff = now - self.window
+        while self and self._base + self._times[self._first % self.size] < cutoff:
+            self._remove_oldest()
+
+    def _remove_oldest(self) -> None:
+        """Remove the oldest sample from the sums and queues."""
+        index = self._first % self.size
+        t = self._times[index]
+        value = self._values[index]
+        self._sum_t -= t
+        self._sum_v -= value
+        self._sum_tt -= t * t
+        self._sum_tv -= t * value
+        self._sum_vv -= value * value
+        if self._min[0][0] == self._first:
+            self._min.popleft()
+        if self._max[0][0] == self._first:
+            self._max.popleft()
+        self._first += 1
+        self._removed += 1
+        if self._removed >= self.size:
+            self._rebase()
+
+    def _clear_sums(self) -> None:
+        """Reset the running sums."""
+        self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = self._sum_vv = 0.0
+
+    def _rebase(self) -> None:
+        """Recompute the sums relative to the oldest sample.
+
+        Removing samples from the sums accumulates rounding errors, so they
+        are rebuilt once per size removals, which is still O(1) amortized.
+        """
+        self._removed = 0
+        self._clear_sums()
+        if not self:
+            return
+        shift = self._times[self._first % self.size]
+        self._base += shift
+        for sequence in range(self._first, self._next):
+            index = sequence % self.size
+            t = self._times[index] - shift
+            value = self._values[index]
+            self._times[index] = t
+            self._sum_t += t
+            self._sum_v += value
+            self._sum_tt += t * t
+            self._sum_tv += t * value
+            self._sum_vv += value * value
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the window."""
+        if not self:
+            return None
+        return self._sum_v / len(self)
+
+    @property
+    def stdev(self) -> float | None:
+        """Return the sample standard deviation of the window."""
+        count = len(self)
+        if count < 2:
+            return None
+        variance = (self._sum_vv - self._sum_v * self._sum_v / count) / (count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    @property
+    def minimum(self) -> float | None:
+        """Return the lowest value in the window."""
+        return self._min[0][1] if self._min else None
+
+    @property
+    def maximum(self) -> float | None:
+        """Return the highest value in the window."""
+        return self._max[0][1] if self._max else None
+
+    @property
+    def slope(self) -> float | None:
+        """Return the least squares trend of the window per hour."""
+        count = len(self)
+        if count < 2:
+            return None
+        denominator = count * self._sum_tt - self._sum_t * self._sum_t
+        if denominator <= 0:
+            return None
+        return (count * self._sum_tv - self._sum_t * self._sum_v) / denominator * 3600
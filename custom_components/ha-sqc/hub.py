@@ -0,0 +1,232 @@
+"""Shared poll scheduler for all SQC controllers."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+from collections import Counter
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_at
+
+from .const import FLEET_SIGNAL, MAX_CONCURRENT_POLLS
+from .fleet import SQCFleet
+
+if TYPE_CHECKING:
+    from .coordinator import SQCDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SQCHub:
+    """Poll every SQC controller from one scheduler.
+
+    Polls are spread evenly over the polling interval instead of firing
+    together, and at most MAX_CONCURRENT_POLLS requests are in flight, no
+    more than one per host.
+
+    The hub also keeps the fleet aggregates, updated with the difference of
+    one device whenever its coordinator notifies its listeners.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the hub."""
+        self.hass = hass
+        self.coordinators: dict[str, SQCDataUpdateCoordinator] = {}
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_POLLS)
+        self._host_locks: dict[str, asyncio.Lock] = {}
+        # Heap of (due time, entry id); an entry is current only if its due
+        # time matches _due, older items are skipped when popped.
+        self._queue: list[tuple[float, str]] = []
+        self._due: dict[str, float] = {}
+        self._polling: set[str] = set()
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self.fleet = SQCFleet()
+        # Sensor platforms that can add the fleet sensors, by entry id; the
+        # owner's platform provides them.
+        self._fleet_platforms: dict[str, Callable[[], None]] = {}
+        self.fleet_owner: str | None = None
+        # Fields of enabled fleet sensors, parsed on every device, with the
+        # callbacks that remove them again by field and entry id.
+        self._fleet_fields: Counter[str] = Counter()
+        self._fleet_field_removers: dict[str, dict[str, Callable[[], None]]] = {}
+
+    @asynccontextmanager
+    async def async_slot(self, host: str) -> AsyncIterator[None]:
+        """Wait until a request to host may be sent."""
+        lock = self._host_locks.setdefault(host, asyncio.Lock())
+        async with lock, self._semaphore:
+            yield
+
+    @callback
+    def async_register(self, entry_id: str, coordinator: SQCDataUpdateCoordinator) -> Callable[[], None]:
+        """Start polling a coordinator, return a callback to stop again."""
+        self.coordinators[entry_id] = coordinator
+        for field in self._fleet_fields:
+            self._fleet_field_removers[field][entry_id] = coordinator.async_add_field(field)
+        self.async_update_fleet(entry_id, coordinator)
+        self._async_spread()
+
+        @callback
+        def _unregister() -> None:
+            self.coordinators.pop(entry_id, None)
+            self._due.pop(entry_id, None)
+            self._host_locks.pop(coordinator.host, None)
+            for removers in self._fleet_field_removers.values():
+                removers.pop(entry_id, None)
+            self.fleet.remove(entry_id)
+            async_dispatcher_send(self.hass, FLEET_SIGNAL)
+            if not self.coordinators and self._unsub_timer is not None:
+                self._unsub_timer()
+                self._unsub_timer = None
+
+        return _unregister
+
+    @callback
+    def async_offer_fleet_platform(
+        self, entry_id: str, add_fleet_sensors: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Offer a sensor platform for the fleet sensors.
+
+        The first platform offered adds them. When the owner's platform is
+        unloaded, the next remaining one adds them again, so the sensors
+        move to another entry instead of disappearing. Returns a callback
+        to withdraw the offer.
+        """
+        self._fleet_platforms[entry_id] = add_fleet_sensors
+        if self.fleet_owner is None:
+            self._async_hand_over_fleet()
+
+        @callback
+        def _withdraw() -> None:
+            self._fleet_platforms.pop(entry_id, None)
+            if self.fleet_owner == entry_id:
+                self.fleet_owner = None
+                self._async_hand_over_fleet()
+
+        return _withdraw
+
+    @callback
+    def _async_hand_over_fleet(self) -> None:
+        """Let the first offered platform add the fleet sensors."""
+        if not self._fleet_platforms:
+            return
+        self.fleet_owner, add_fleet_sensors = next(iter(self._fleet_platforms.items()))
+        _LOGGER.debug("Fleet sensors are provided by entry %s", self.fleet_owner)
+        add_fleet_sensors()
+
+    @callback
+    def async_update_fleet(self, entry_id: str, coordinator: SQCDataUpdateCoordinator) -> None:
+        """Replace the contribution of one device to the fleet aggregates."""
+        if self.coordinators.get(entry_id) is not coordinator:
+            return
+        self.fleet.update(
+            entry_id,
+            coordinator.data,
+            coordinator.last_update_success and coordinator.data is not None,
+        )
+        async_dispatcher_send(self.hass, FLEET_SIGNAL)
+
+    @callback
+    def async_add_fleet_field(self, field: str) -> Callable[[], None]:
+        """Parse field on every device, return a callback to stop again."""
+        if field not in self._fleet_fields:
+            self._fleet_field_removers[field] = {
+                entry_id: coordinator.async_add_field(field)
+                for entry_id, coordinator in self.coordinators.items()
+            }
+        self._fleet_fields[field] += 1
+
+        @callback
+        def _remove_field() -> None:
+            self._fleet_fields[field] -= 1
+            if not self._fleet_fields[field]:
+                del self._fleet_fields[field]
+                for remove in self._fleet_field_removers.pop(field).values():
+                    remove()
+
+        return _remove_field
+
+    @callback
+    def _async_spread(self) -> None:
+        """Spread the next poll of every device evenly over its interval."""
+        now = self.hass.loop.time()
+        count = len(self.coordinators)
+        self._queue.clear()
+        self._due.clear()
+        for index, (entry_id, coordinator) in enumerate(self.coordinators.items()):
+            offset = coordinator.poll_interval.total_seconds() * (index + 1) / count
+            self._async_schedule_poll(entry_id, now + offset)
+        self._async_arm_timer()
+
+    @callback
+    def _async_schedule_poll(self, entry_id: str, when: float) -> None:
+        """Queue the next poll of a device."""
+        self._due[entry_id] = when
+        heapq.heappush(self._queue, (when, entry_id))
+
+    @callback
+    def _async_arm_timer(self) -> None:
+        """Wake up when the earliest poll is due."""
+        while self._queue and self._due.get(self._queue[0][1]) != self._queue[0][0]:
+            heapq.heappop(self._queue)
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        if self._queue:
+            self._unsub_timer = async_call_at(self.hass, self._async_run_due, self._queue[0][0])
+
+    @callback
+    def _async_run_due(self, _now: float) -> None:
+        """Start every poll that is due."""
+        self._unsub_timer = None
+        now = self.hass.loop.time()
+        while self._queue and self._queue[0][0] <= now:
+            when, entry_id = heapq.heappop(self._queue)
+            if self._due.get(entry_id) != when:
+                continue
+            del self._due[entry_id]
+            if entry_id in self._polling:
+                # The running poll queues the next one when it finishes.
+                continue
+            self.hass.async_create_background_task(
+                self._async_poll(entry_id), f"ha-sqc poll {entry_id}"
+            )
+        self._async_arm_timer()
+
+    async def _async_poll(self, entry_id: str) -> None:
+        """Refresh one device and queue its next poll."""
+        if (coordinator := self.coordinators.get(entry_id)) is None:
+            return
+        start = self.hass.loop.time()
+        self._polling.add(entry_id)
+        try:
+            await coordinator.async_refresh()
+        finally:
+            self._polling.discard(entry_id)
+        if self.coordinators.get(entry_id) is not coordinator:
+            return
+        if isinstance(coordinator.last_exception, ConfigEntryAuthFailed):
+            # Stop posting the rejected PIN; reauthenticating reloads the
+            # entry, which registers it again.
+            _LOGGER.debug("Stopped polling %s until it is reauthenticated", coordinator.host)
+            return
+        if (next_probe := coordinator.breaker.next_probe) is not None:
+            # The breaker times its delay from the failure, not from the
+            # start of the poll; waking up earlier would be rejected.
+            when = next_probe
+        else:
+            when = start + coordinator.poll_interval.total_seconds()
+        _LOGGER.debug(
+            "Polled %s in %.3fs, next poll in %.1fs",
+            coordinator.host,
+            coordinator.poll_latency or 0,
+            when - self.hass.loop.time(),
+        )
+        self._async_schedule_poll(entry_id, when)
+        self._async_arm_timer()
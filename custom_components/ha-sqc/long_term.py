@@ -0,0 +1,189 @@
+"""Hourly long-term statistics of SQC readings."""
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import (
+    CONCENTRATION_PARTS_PER_MILLION,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import STATISTICS_SOURCE
+
+if TYPE_CHECKING:
+    from .models import SQCSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+# Field: (name, unit) of the hourly mean, minimum and maximum.
+MEAN_STATISTICS: dict[str, tuple[str, str | None]] = {
+    "temperature": ("Water Temperature", UnitOfTemperature.CELSIUS),
+    "ph": ("Water pH", None),
+    "co2": ("Water CO2", CONCENTRATION_PARTS_PER_MILLION),
+}
+# Cumulative device counter turned into an hourly sum.
+USAGE_FIELD = "co2_counter"
+USAGE_NAME = "CO2 Usage"
+
+
+@dataclass(slots=True)
+class HourlyBucket:
+    """Readings of one field within one hour."""
+
+    start: datetime
+    count: int
+    total: float
+    minimum: float
+    maximum: float
+
+    @classmethod
+    def first(cls, start: datetime, value: float) -> HourlyBucket:
+        """Return a bucket holding one reading."""
+        return cls(start, 1, value, value, value)
+
+    def add(self, value: float) -> None:
+        """Add a reading."""
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def as_statistic(self) -> StatisticData:
+        """Return the statistics row of the hour."""
+        return StatisticData(
+            start=self.start,
+            mean=self.total / self.count,
+            min=self.minimum,
+            max=self.maximum,
+        )
+
+
+class SQCStatistics:
+    """Aggregate readings per hour and import them as external statistics.
+
+    Readings are folded into one bucket per field and hour in memory, and
+    finished hours are written in one batch per statistic once an hour,
+    instead of the recorder compiling them from every state row. The CO2
+    counter of the device keeps counting while Home Assistant is down, so
+    usage during a downtime ends up in the first hour after it.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, name: str) -> None:
+        """Initialize the statistics."""
+        self.hass = hass
+        self._name = name
+        # Statistic ids must be lower case, and the source a valid domain.
+        self._object_prefix = entry_id.lower()
+        self._buckets: dict[str, HourlyBucket] = {}
+        self._pending: defaultdict[str, list[StatisticData]] = defaultdict(list)
+        self._usage_hour: datetime | None = None
+        self._usage_state: float | None = None
+        self._usage_sum = 0.0
+        # Start of the last imported hour, earlier hours are not imported again.
+        self._imported_until: datetime | None = None
+
+    def statistic_id(self, field: str) -> str:
+        """Return the id of the statistic of a field."""
+        return f"{STATISTICS_SOURCE}:{self._object_prefix}_{field}"
+
+    async def async_load(self) -> None:
+        """Continue the usage sum from the last imported hour."""
+        statistic_id = self.statistic_id(USAGE_FIELD)
+        last = await get_instance(self.hass).async_add_executor_job(
+            get_last_statistics, self.hass, 1, statistic_id, False, {"state", "sum"}
+        )
+        if not (rows := last.get(statistic_id)):
+            return
+        row = rows[0]
+        self._usage_state = row.get("state")
+        self._usage_sum = row.get("sum") or 0.0
+        self._imported_until = dt_util.utc_from_timestamp(row["start"])
+
+    @callback
+    def record(self, snapshot: SQCSnapshot, now: datetime) -> None:
+        """Add the readings of a poll."""
+        hour = now.replace(minute=0, second=0, microsecond=0)
+        for field in MEAN_STATISTICS:
+            if (value := getattr(snapshot, field)) is None:
+                continue
+            bucket = self._buckets.get(field)
+            if bucket is None or bucket.start != hour:
+                if bucket is not None:
+                    self._pending[field].append(bucket.as_statistic())
+                self._buckets[field] = HourlyBucket.first(hour, value)
+            else:
+                bucket.add(value)
+
+        if (counter := snapshot.co2_counter) is None:
+            return
+        if self._usage_hour is not None and self._usage_hour != hour:
+            self._close_usage_hour()
+        if self._usage_state is not None:
+            delta = counter - self._usage_state
+            # The counter starts from zero again after a CO2 restart.
+            self._usage_sum += delta if delta >= 0 else counter
+        self._usage_state = counter
+        self._usage_hour = hour
+
+    def _close_usage_hour(self) -> None:
+        """Queue the usage row of the hour that ended."""
+        self._pending[USAGE_FIELD].append(
+            StatisticData(start=self._usage_hour, state=self._usage_state, sum=self._usage_sum)
+        )
+        self._usage_hour = None
+
+    @callback
+    def async_flush(self, now: datetime | None = None) -> None:
+        """Import every finished hour."""
+        hour = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+        for field, bucket in list(self._buckets.items()):
+            if bucket.start < hour:
+                self._pending[field].append(bucket.as_statistic())
+                del self._buckets[field]
+        if self._usage_hour is not None and self._usage_hour < hour:
+            self._close_usage_hour()
+
+        for field, rows in self._pending.items():
+            if self._imported_until is not None:
+                rows = [row for row in rows if row["start"] > self._imported_until]
+            if rows:
+                async_add_external_statistics(self.hass, self._metadata(field), rows)
+        self._pending.clear()
+
+    def _metadata(self, field: str) -> StatisticMetaData:
+        """Return the metadata of the statistic of a field."""
+        if field == USAGE_FIELD:
+            return StatisticMetaData(
+                mean_type=StatisticMeanType.NONE,
+                has_sum=True,
+                name=f"{self._name} {USAGE_NAME}",
+                source=STATISTICS_SOURCE,
+                statistic_id=self.statistic_id(field),
+                unit_of_measurement=UnitOfTime.HOURS,
+            )
+        name, unit = MEAN_STATISTICS[field]
+        return StatisticMetaData(
+            mean_type=StatisticMeanType.ARITHMETIC,
+            has_sum=False,
+            name=f"{self._name} {name}",
+            source=STATISTICS_SOURCE,
+            statistic_id=self.statistic_id(field),
+            unit_of_measurement=unit,
+        )
@@ -0,0 +1,45 @@
+"""Data models for the SQC integration."""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any
+
+
+@dataclass(slots=True, frozen=True)
+class SQCSnapshot:
+    """Values parsed from a single poll of the SQC home page."""
+
+    temperature: float | None = None
+    ph: float | None = None
+    co2: float | None = None
+    co2_counter: float | None = None
+    co2_restart: datetime | None = None
+    alarm: str | None = None
+    ph_control: bool | None = None
+    title: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the snapshot as JSON compatible data."""
+        data = asdict(self)
+        if self.co2_restart is not None:
+            data["co2_restart"] = self.co2_restart.isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> SQCSnapshot:
+        """Restore a snapshot saved with as_dict."""
+        data = {key: value for key, value in data.items() if key in cls.__dataclass_fields__}
+        if data.get("co2_restart") is not None:
+            data["co2_restart"] = datetime.fromisoformat(data["co2_restart"])
+        return cls(**data)
+
+
+@dataclass(slots=True, frozen=True)
+class SQCCachedPage:
+    """Fields parsed from a page, with what identifies that exact page."""
+
+    fingerprint: bytes
+    etag: str | None
+    last_modified: str | None
+    values: dict[str, Any]
@@ -0,0 +1,129 @@
+"""Parser for the SQC home page."""
+from __future__ import annotations
+
+import logging
+import re
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Any
+
+from .models import SQCSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+def _parse_restart(value: str) -> datetime:
+    """Parse the CO2 restart date shown in the device's local time."""
+    local_tz = datetime.now().astimezone().tzinfo
+    return datetime.strptime(value, "%Y-%m-%d %H:%M").replace(tzinfo=local_tz)
+
+
+@dataclass(frozen=True, slots=True)
+class SQCField:
+    """How to extract one field from the home page.
+
+    The pattern must contain exactly one named group, called after the
+    snapshot attribute the field is stored in.
+    """
+
+    pattern: str
+    convert: Callable[[str], Any]
+
+
+# Every field the page exposes, keyed by snapshot attribute.
+FIELDS: dict[str, SQCField] = {
+    "title": SQCField(r"<title>(?P<title>[^<]+)</title>", str),
+    "temperature": SQCField(r"Temperatura = (?P<temperature>[\d.]+)ºC", float),
+    "ph": SQCField(r"pH = (?P<ph>[\d.]+) \[pH\]", float),
+    "co2": SQCField(r"CO<sub>2</sub> = <b>(?P<co2>[\d.]+) ppm</b>", float),
+    "co2_counter": SQCField(
+        r"Licznik CO<sub>2</sub>: <b>(?P<co2_counter>[\d.]+) godz.</b>", float
+    ),
+    "co2_restart": SQCField(
+        r"Data restartu CO<sub>2</sub>:</br>(?P<co2_restart>[\d-]+ [\d:]+)</p>",
+        _parse_restart,
+    ),
+    "alarm": SQCField(
+        r"Alarm: <b>(?P<alarm>[\w\s]+)</b>", lambda value: value.lower().strip()
+    ),
+    "ph_control": SQCField(
+        r"Sterowanie pH:  <b>(?P<ph_control>ON|OFF)</b>", lambda value: value == "ON"
+    ),
+}
+
+
+# Marks a real page, as opposed to what a logged out device sends.
+DOCTYPE_PATTERN = r"(?P<doctype><!DOCTYPE html>)"
+
+# Text kept between chunks, so a field split across two chunks is still
+# found. Must be longer than any single field match.
+MAX_FIELD_LENGTH = 256
+
+
+@lru_cache(maxsize=16)
+def _page_pattern(fields: frozenset[str]) -> re.Pattern[str]:
+    """Return one alternation of the given fields, to scan the page once."""
+    patterns = [DOCTYPE_PATTERN]
+    patterns.extend(FIELDS[field].pattern for field in FIELDS if field in fields)
+    return re.compile("|".join(patterns))
+
+
+class SQCPageParser:
+    """Incrementally parse the home page from chunks of text.
+
+    Only the requested fields are extracted and the parser keeps nothing
+    of the page but a short tail between chunks. Once done, the remaining
+    chunks need not be parsed; they are still read from the device, see
+    SQCClient.async_fetch_page.
+    """
+
+    def __init__(self, fields: Iterable[str] | None = None) -> None:
+        """Initialize the parser."""
+        self._fields = frozenset(FIELDS if fields is None else fields)
+        self._pattern = _page_pattern(self._fields)
+        self._values: dict[str, Any] = {}
+        self._buffer = ""
+        self.is_page = False
+
+    @property
+    def done(self) -> bool:
+        """Return True once the page marker and every field were found."""
+        return self.is_page and len(self._values) == len(self._fields)
+
+    def feed(self, text: str) -> None:
+        """Parse the next chunk of the page."""
+        buffer = self._buffer + text
+        end = 0
+        for match in self._pattern.finditer(buffer):
+            end = match.end()
+            field = match.lastgroup
+            if field == "doctype":
+                self.is_page = True
+            elif field is not None and field not in self._values:
+                self._values[field] = _convert(field, match.group(field))
+        self._buffer = buffer[max(end, len(buffer) - MAX_FIELD_LENGTH):]
+
+    def values(self) -> dict[str, Any]:
+        """Return every requested field, None if it was not found."""
+        return {field: self._values.get(field) for field in self._fields}
+
+    def snapshot(self) -> SQCSnapshot:
+        """Return the fields found so far."""
+        return SQCSnapshot(**self._values)
+
+
+def _convert(field: str, raw: str) -> Any:
+    """Convert the raw text of a field."""
+    try:
+        return FIELDS[field].convert(raw)
+    except ValueError:
+        _LOGGER.warning("Failed to parse %s: %s", field, raw)
+        return None
+
+
+def parse_home_page(html: str, fields: Iterable[str] | None = None) -> SQCSnapshot:
+    """Parse the SQC home page into a snapshot in a single pass."""
+    parser = SQCPageParser(fields)
+    parser.feed(html)
+    return parser.snapshot()
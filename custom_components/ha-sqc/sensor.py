@@ -2,26 +2,214 @@
 from __future__ import annotations
 
 import logging
-import re
-from datetime import datetime
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTemperature, UnitOfTime, CONCENTRATION_PARTS_PER_MILLION
-from homeassistant.core import HomeAssistant
+from homeassistant.const import UnitOfTemperature, UnitOfTime, CONCENTRATION_PARTS_PER_MILLION, PERCENTAGE, EntityCategory
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .breaker import BreakerState
+from .const import ALARM_STATES, DOMAIN, FLEET_SIGNAL, STATISTICS_FIELDS
 from .coordinator import SQCDataUpdateCoordinator
+from .entity import SQCEntity
+from .fleet import SQCFleet
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, kw_only=True)
+class SQCSensorEntityDescription(SensorEntityDescription):
+    """Describes an SQC sensor read from one field of the home page."""
+
+    field: str
+
+
+# Extraction and conversion of each field are declared in parser.FIELDS.
+SENSOR_DESCRIPTIONS: tuple[SQCSensorEntityDescription, ...] = (
+    SQCSensorEntityDescription(
+        key="water_temp",
+        field="temperature",
+        name="Water Temperature",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+    ),
+    SQCSensorEntityDescription(
+        key="water_ph",
+        field="ph",
+        name="Water pH",
+        device_class=SensorDeviceClass.PH,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SQCSensorEntityDescription(
+        key="water_co2",
+        field="co2",
+        name="Water CO2",
+        device_class=SensorDeviceClass.CO2,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=CONCENTRATION_PARTS_PER_MILLION,
+    ),
+    SQCSensorEntityDescription(
+        key="counter_co2",
+        field="co2_counter",
+        name="CO2 Counter",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        entity_registry_enabled_default=False,
+    ),
+    SQCSensorEntityDescription(
+        key="restart_co2",
+        field="co2_restart",
+        name="CO2 Restart",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_registry_enabled_default=False,
+    ),
+    SQCSensorEntityDescription(
+        key="alarm",
+        field="alarm",
+        name="Alarm",
+        device_class=SensorDeviceClass.ENUM,
+        options=ALARM_STATES,
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class SQCTrendSensorEntityDescription(SensorEntityDescription):
+    """Describes a rolling statistic of one field over the last minutes."""
+
+    field: str
+    statistic: str
+
+
+# (key suffix, name suffix, RollingSeries attribute, in the unit of the field)
+TREND_STATISTICS = (
+    ("mean", "Mean", "mean", True),
+    ("min", "Min", "minimum", True),
+    ("max", "Max", "maximum", True),
+    ("stdev", "Std Dev", "stdev", False),
+    ("slope", "Trend", "slope", False),
+)
+
+
+def _trend_descriptions(
+    field: str,
+    key: str,
+    name: str,
+    device_class: SensorDeviceClass | None,
+    unit: str | None,
+    slope_unit: str,
+) -> tuple[SQCTrendSensorEntityDescription, ...]:
+    """Return the trend sensors of one field."""
+    return tuple(
+        SQCTrendSensorEntityDescription(
+            key=f"{key}_{suffix}",
+            field=field,
+            statistic=statistic,
+            name=f"{name} {label}",
+            device_class=device_class if same_unit else None,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=slope_unit if statistic == "slope" else unit,
+            entity_registry_enabled_default=False,
+        )
+        for suffix, label, statistic, same_unit in TREND_STATISTICS
+    )
+
+
+TREND_SENSOR_DESCRIPTIONS: tuple[SQCTrendSensorEntityDescription, ...] = (
+    *_trend_descriptions(
+        "temperature", "water_temp", "Water Temperature",
+        SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS, "°C/h",
+    ),
+    *_trend_descriptions("ph", "water_ph", "Water pH", SensorDeviceClass.PH, None, "pH/h"),
+    *_trend_descriptions(
+        "co2", "water_co2", "Water CO2",
+        SensorDeviceClass.CO2, CONCENTRATION_PARTS_PER_MILLION, "ppm/h",
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class SQCFleetSensorEntityDescription(SensorEntityDescription):
+    """Describes an aggregate over all SQC controllers."""
+
+    value_fn: Callable[[SQCFleet], Any]
+    # Field every device must parse for this aggregate.
+    field: str | None = None
+
+
+# (key suffix, name suffix, FleetReading attribute)
+FLEET_STATISTICS = (
+    ("min", "Min", "minimum"),
+    ("max", "Max", "maximum"),
+    ("mean", "Mean", "mean"),
+)
+
+
+def _fleet_descriptions(
+    field: str,
+    key: str,
+    name: str,
+    device_class: SensorDeviceClass | None,
+    unit: str | None,
+) -> tuple[SQCFleetSensorEntityDescription, ...]:
+    """Return the fleet sensors of one field."""
+    return tuple(
+        SQCFleetSensorEntityDescription(
+            key=f"fleet_{key}_{suffix}",
+            field=field,
+            value_fn=lambda fleet, field=field, statistic=statistic: getattr(
+                fleet.readings[field], statistic
+            ),
+            name=f"Fleet {name} {label}",
+            device_class=device_class,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=unit,
+            entity_registry_enabled_default=False,
+        )
+        for suffix, label, statistic in FLEET_STATISTICS
+    )
+
+
+FLEET_SENSOR_DESCRIPTIONS: tuple[SQCFleetSensorEntityDescription, ...] = (
+    *_fleet_descriptions(
+        "temperature", "water_temp", "Water Temperature",
+        SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS,
+    ),
+    *_fleet_descriptions("ph", "water_ph", "Water pH", SensorDeviceClass.PH, None),
+    *_fleet_descriptions(
+        "co2", "water_co2", "Water CO2",
+        SensorDeviceClass.CO2, CONCENTRATION_PARTS_PER_MILLION,
+    ),
+    SQCFleetSensorEntityDescription(
+        key="fleet_alarms",
+        value_fn=lambda fleet: len(fleet.in_alarm),
+        name="Fleet Tanks In Alarm",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    SQCFleetSensorEntityDescription(
+        key="fleet_offline",
+        value_fn=lambda fleet: len(fleet.offline),
+        name="Fleet Tanks Offline",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -30,236 +218,302 @@ async def async_setup_entry(
     """Set up the sensor platform."""
     coordinator: SQCDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id]
     
-    # Define your sensors here
-    entities = [
-        SQCWaterTempSensor(coordinator, config_entry),
-        SQCWaterPHSensor(coordinator, config_entry),
-        SQCWaterCO2Sensor(coordinator, config_entry),
+    entities: list[SensorEntity] = [
+        SQCSensor(coordinator, config_entry, description)
+        for description in SENSOR_DESCRIPTIONS
     ]
+    entities.extend(
+        SQCTrendSensor(coordinator, config_entry, description)
+        for description in TREND_SENSOR_DESCRIPTIONS
+    )
+    entities.extend(
+        [
+            SQCConnectionSensor(coordinator, config_entry),
+            SQCPollLatencySensor(coordinator, config_entry),
+            SQCErrorRateSensor(coordinator, config_entry),
+            SQCLoginCountSensor(coordinator, config_entry),
+        ]
+    )
     
     async_add_entities(entities)
 
+    @callback
+    def _async_add_fleet_sensors() -> None:
+        async_add_entities(
+            SQCFleetSensor(coordinator, description)
+            for description in FLEET_SENSOR_DESCRIPTIONS
+        )
 
-class SQCSensorBase(CoordinatorEntity[SQCDataUpdateCoordinator], SensorEntity):
+    # One entry provides the fleet sensors; the hub moves them to another
+    # entry when this one is unloaded.
+    config_entry.async_on_unload(
+        coordinator.hub.async_offer_fleet_platform(
+            config_entry.entry_id, _async_add_fleet_sensors
+        )
+    )
+
+
+class SQCSensorBase(SQCEntity, SensorEntity):
     """Base class for SQC sensors."""
 
+    def _state_key(self) -> tuple[Any, ...]:
+        """Return everything that ends up in this entity's state."""
+        return (*super()._state_key(), self.native_value)
+
+
+class SQCSensor(SQCSensorBase):
+    """Sensor for one field of the SQC home page."""
+
+    entity_description: SQCSensorEntityDescription
+
     def __init__(
         self,
         coordinator: SQCDataUpdateCoordinator,
         config_entry: ConfigEntry,
-        sensor_key: str,
-        name: str,
+        description: SQCSensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._sensor_key = sensor_key
-        self._attr_name = name
-        self._attr_unique_id = f"{config_entry.entry_id}_{sensor_key}"
-        self._attr_device_info = self.coordinator._get_device_info(config_entry.entry_id)
+        super().__init__(coordinator, config_entry, description.key, description.name)
+        self.entity_description = description
+        self._field = description.field
+        if coordinator.statistics is not None and description.field in STATISTICS_FIELDS:
+            # The integration imports the statistics of this field itself.
+            self._attr_state_class = None
+
     @property
-    def available(self) -> bool:
-        """Return True if the sensor is available."""
-        return self.coordinator.last_update_success and self.coordinator.data.get("online", False)
+    def native_value(self):
+        """Return the state of the sensor."""
+        if not self.coordinator.data:
+            return None
+        return getattr(self.coordinator.data, self._field)
 
-class SQCWaterTempSensor(SQCSensorBase):
-    """Water temperature sensor for SQC."""
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Add the unfiltered reading if a spike filter is active."""
+        attributes = super().extra_state_attributes
+        if (raw := self.coordinator.raw.get(self._field)) is not None:
+            # Written with state changes only, so spikes alone cause no writes.
+            attributes = {**(attributes or {}), "raw": raw}
+        return attributes
+
+
+class SQCTrendSensor(SQCSensorBase):
+    """Rolling statistic of one field, kept in memory by the coordinator."""
+
+    entity_description: SQCTrendSensorEntityDescription
 
     def __init__(
         self,
         coordinator: SQCDataUpdateCoordinator,
         config_entry: ConfigEntry,
+        description: SQCTrendSensorEntityDescription,
     ) -> None:
-        """Initialize the temperature sensor."""
-        super().__init__(coordinator, config_entry, "water_temp", "Water Temperature")
-        self._attr_device_class = SensorDeviceClass.TEMPERATURE
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry, description.key, description.name)
+        self.entity_description = description
+        self._field = description.field
+        self._series = coordinator.history[description.field]
+
+    async def async_added_to_hass(self) -> None:
+        """Also update after polls that did not change the readings."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, self.coordinator.poll_signal, self._handle_coordinator_update
+            )
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return True while there are enough samples for the statistic."""
+        return super().available and self.native_value is not None
 
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        if not self.coordinator.data:
-            return None
-        
-        html = self.coordinator.data.get("html")
-        if not html:
-            _LOGGER.warning("No sensor data available")
-            return None
+        value = getattr(self._series, self.entity_description.statistic)
+        return None if value is None else round(value, 3)
 
-        pattern = r"Temperatura = ([\d.]+)ºC"
-        match = re.search(pattern, html)
-        if match:
-            return float(match.group(1))
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return no attributes, the history is not restored."""
         return None
-    
-class SQCWaterPHSensor(SQCSensorBase):
-    """Water pH sensor for SQC."""
+
+
+class SQCConnectionSensor(SQCSensorBase):
+    """Circuit breaker state of the connection to the SQC."""
 
     def __init__(
         self,
         coordinator: SQCDataUpdateCoordinator,
         config_entry: ConfigEntry,
     ) -> None:
-        """Initialize the ph sensor."""
-        super().__init__(coordinator, config_entry, "water_ph", "Water pH")
-        self._attr_device_class = SensorDeviceClass.PH
-        self._attr_state_class = SensorStateClass.MEASUREMENT
+        """Initialize the connection sensor."""
+        super().__init__(coordinator, config_entry, "connection", "Connection")
+        self._attr_device_class = SensorDeviceClass.ENUM
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_options = [state.value for state in BreakerState]
+
+    @property
+    def available(self) -> bool:
+        """Return True, the breaker state is known even when the device is not."""
+        return True
 
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        if not self.coordinator.data:
-            return None
-        
-        html = self.coordinator.data.get("html")
-        if not html:
-            _LOGGER.warning("No sensor data available")
-            return None
+        return self.coordinator.breaker.state.value
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the next probe time while the breaker is open."""
+        return {"next_probe": self.coordinator.next_probe}
+
+    def _state_key(self) -> tuple[Any, ...]:
+        """Return everything that ends up in this entity's state."""
+        return (self.native_value, self.coordinator.next_probe)
 
-        pattern = r"pH = ([\d.]+) \[pH\]"
-        match = re.search(pattern, html)
-        if match:
-            return float(match.group(1))
-        return None
-    
-class SQCWaterCO2Sensor(SQCSensorBase):
-    """Water CO2 sensor for SQC."""
+
+class SQCPollStatsSensorBase(SQCSensorBase):
+    """Base class for diagnostic sensors about polling the SQC."""
 
     def __init__(
         self,
         coordinator: SQCDataUpdateCoordinator,
         config_entry: ConfigEntry,
+        sensor_key: str,
+        name: str,
     ) -> None:
-        """Initialize the CO2 sensor."""
-        super().__init__(coordinator, config_entry, "water_co2", "Water CO2")
-        self._attr_device_class = SensorDeviceClass.CO2
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_native_unit_of_measurement = CONCENTRATION_PARTS_PER_MILLION
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry, sensor_key, name)
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_entity_registry_enabled_default = False
+
+    async def async_added_to_hass(self) -> None:
+        """Also update after polls that did not change the readings."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, self.coordinator.poll_signal, self._handle_coordinator_update
+            )
+        )
 
     @property
-    def native_value(self):
-        """Return the state of the sensor."""
-        if not self.coordinator.data:
-            return None
-        
-        html = self.coordinator.data.get("html")
-        if not html:
-            _LOGGER.warning("No sensor data available")
-            return None
+    def available(self) -> bool:
+        """Return True once the device was polled."""
+        return self.coordinator.stats.polls > 0
 
-        pattern = r"CO<sub>2</sub> = <b>([\d.]+) ppm</b>"
-        match = re.search(pattern, html)
-        if match:
-            return float(match.group(1))
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return no attributes, these values are never restored."""
         return None
-    
-class SQCCO2CounterSensor(SQCSensorBase):
-    """CO2 counter for SQC."""
+
+
+class SQCPollLatencySensor(SQCPollStatsSensorBase):
+    """Duration of the last poll of the SQC."""
 
     def __init__(
         self,
         coordinator: SQCDataUpdateCoordinator,
         config_entry: ConfigEntry,
     ) -> None:
-        """Initialize the CO2 counter sensor."""
-        super().__init__(coordinator, config_entry, "counter_co2", "CO2 Counter")
+        """Initialize the poll latency sensor."""
+        super().__init__(coordinator, config_entry, "poll_latency", "Poll Latency")
         self._attr_device_class = SensorDeviceClass.DURATION
         self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_native_unit_of_measurement = UnitOfTime.HOURS
+        self._attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
 
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        if not self.coordinator.data:
-            return None
-        
-        html = self.coordinator.data.get("html")
-        if not html:
-            _LOGGER.warning("No sensor data available")
+        if self.coordinator.poll_latency is None:
             return None
-        pattern = r"Licznik CO<sub>2</sub>: <b>([\d.]+) godz.</b>"
-        match = re.search(pattern, html)
-        if match:
-            return float(match.group(1))
-        return None
+        return round(self.coordinator.poll_latency * 1000)
+
 
-class SQCCO2RestartSensor(SQCSensorBase):
-    """CO2 restart timestamp for SQC."""
+class SQCErrorRateSensor(SQCPollStatsSensorBase):
+    """Share of recent polls of the SQC that failed."""
 
     def __init__(
         self,
         coordinator: SQCDataUpdateCoordinator,
         config_entry: ConfigEntry,
     ) -> None:
-        """Initialize the CO2 restart timestamp sensor."""
-        super().__init__(coordinator, config_entry, "restart_co2", "CO2 Restart")
-        self._attr_device_class = SensorDeviceClass.TIMESTAMP
+        """Initialize the error rate sensor."""
+        super().__init__(coordinator, config_entry, "error_rate", "Error Rate")
         self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_native_unit_of_measurement = PERCENTAGE
 
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        if not self.coordinator.data:
+        if (error_rate := self.coordinator.stats.error_rate) is None:
             return None
-        
-        html = self.coordinator.data.get("html")
-        if not html:
-            _LOGGER.warning("No sensor data available")
-            return None
-        pattern = r"Data restartu CO<sub>2</sub>:</br>([\d-]+ [\d:]+)</p>"
-        match = re.search(pattern, html)
-        if match:
-            local_tz = datetime.now().astimezone().tzinfo
-            try:
-                dt = datetime.strptime(match.group(1), "%Y-%m-%d %H:%M")
-                return dt.replace(tzinfo=local_tz).isoformat()
-            except ValueError:
-                _LOGGER.warning("Failed to parse CO2 restart timestamp: %s", match.group(1))
-                return None
-        return None
+        return round(error_rate * 100, 1)
 
-class SQCAlarmSensor(SQCSensorBase):
-    """Alarm status for SQC."""
+
+class SQCLoginCountSensor(SQCPollStatsSensorBase):
+    """Number of logins to the SQC since startup."""
 
     def __init__(
         self,
         coordinator: SQCDataUpdateCoordinator,
         config_entry: ConfigEntry,
     ) -> None:
-        """Initialize the alarm sensor."""
-        super().__init__(coordinator, config_entry, "alarm", "Alarm")
-        self._attr_device_class = SensorDeviceClass.ENUM
-        self._attr_state_class = SensorStateClass.MEASUREMENT
+        """Initialize the login count sensor."""
+        super().__init__(coordinator, config_entry, "login_count", "Logins")
+        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
 
     @property
-    def options(self) -> list[str]:
-        """Return the values for the ENUM."""
-        values = [
-            "brak",
-            "brak sondy ph",
-            "błąd konfiguracji alarmów ph",
-            "ph za niskie",
-            "ph za wysokie",
-            "brak sondy temperatury", 
-            "temperatura za niska",
-            "temperatura za wysoka",
-            "błąd konfiguracji alarmów temperatury"
-        ]
+    def native_value(self):
+        """Return the state of the sensor."""
+        return self.coordinator.client.sqc_session.login_count
+
+
+class SQCFleetSensor(SensorEntity):
+    """Aggregate over all SQC controllers, kept up to date by the hub."""
+
+    entity_description: SQCFleetSensorEntityDescription
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        coordinator: SQCDataUpdateCoordinator,
+        description: SQCFleetSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._hub = coordinator.hub
+        self._attr_unique_id = f"{DOMAIN}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, "fleet")},
+            name="SQC Fleet",
+            manufacturer="SeaQuaComp",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+        self._written_state: Any = None
 
-        return values
+    async def async_added_to_hass(self) -> None:
+        """Follow the fleet aggregates and have every device parse the field."""
+        await super().async_added_to_hass()
+        if (field := self.entity_description.field) is not None:
+            self.async_on_remove(self._hub.async_add_fleet_field(field))
+        self.async_on_remove(
+            async_dispatcher_connect(self.hass, FLEET_SIGNAL, self._handle_fleet_update)
+        )
+        self._written_state = self.native_value
 
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        if not self.coordinator.data:
-            return None
-        
-        html = self.coordinator.data.get("html")
-        if not html:
-            _LOGGER.warning("No sensor data available")
-            return None
-        pattern = r"Alarm: <b>([\w\s]+)</b>"
-        match = re.search(pattern, html)
-        if match:
-            return match.group(1).lower().strip()
-        return None
\ No newline at end of file
+        value = self.entity_description.value_fn(self._hub.fleet)
+        return round(value, 3) if isinstance(value, float) else value
+
+    @callback
+    def _handle_fleet_update(self) -> None:
+        """Write state only when the aggregate changed."""
+        value = self.native_value
+        if value == self._written_state:
+            return
+        self._written_state = value
+        self.async_write_ha_state()
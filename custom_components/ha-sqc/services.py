@@ -0,0 +1,100 @@
+"""Services of the SQC integration."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_MAX_AGE,
+    DEFAULT_MAX_AGE,
+    DOMAIN,
+    SERVICE_GET_SNAPSHOT,
+)
+from .coordinator import SQCDataUpdateCoordinator
+
+GET_SNAPSHOT_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_MAX_AGE, default=DEFAULT_MAX_AGE): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+    }
+)
+
+
+def _is_fresh(coordinator: SQCDataUpdateCoordinator, max_age: timedelta) -> bool:
+    """Return True if the last snapshot of a device is recent enough."""
+    return (
+        coordinator.last_update is not None
+        and coordinator.last_update_success
+        and dt_util.utcnow() - coordinator.last_update <= max_age
+    )
+
+
+def _device_response(coordinator: SQCDataUpdateCoordinator) -> dict[str, Any]:
+    """Return what the service reports about one device."""
+    data = coordinator.data
+    snapshot = data.as_dict() if data is not None else None
+    if snapshot is not None and (fields := coordinator.fields) is not None:
+        # A restored snapshot may hold values of fields no longer read.
+        snapshot = {
+            field: value if field in fields else None
+            for field, value in snapshot.items()
+        }
+    return {
+        "title": coordinator.device_title,
+        "host": coordinator.host,
+        "available": coordinator.last_update_success and data is not None,
+        "stale": coordinator.stale,
+        "updated": coordinator.last_update.isoformat() if coordinator.last_update else None,
+        "snapshot": snapshot,
+    }
+
+
+async def _async_get_snapshot(call: ServiceCall) -> ServiceResponse:
+    """Return the snapshots of the selected devices, refreshing old ones."""
+    hass = call.hass
+    coordinators: dict[str, SQCDataUpdateCoordinator] = hass.data.get(DOMAIN, {})
+    if (entry_ids := call.data.get(ATTR_CONFIG_ENTRY_ID)) is None:
+        selected = dict(coordinators)
+    else:
+        if unknown := [entry_id for entry_id in entry_ids if entry_id not in coordinators]:
+            raise ServiceValidationError(f"Not a loaded SQC entry: {', '.join(unknown)}")
+        selected = {entry_id: coordinators[entry_id] for entry_id in entry_ids}
+
+    # Only devices without a recent snapshot are polled, all at once; the
+    # hub still limits how many requests are in flight.
+    max_age = timedelta(seconds=call.data[ATTR_MAX_AGE])
+    await asyncio.gather(
+        *(
+            coordinator.async_refresh()
+            for coordinator in selected.values()
+            if not _is_fresh(coordinator, max_age)
+        )
+    )
+    return {
+        "devices": {
+            entry_id: _device_response(coordinator)
+            for entry_id, coordinator in selected.items()
+        }
+    }
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_SNAPSHOT,
+        _async_get_snapshot,
+        schema=GET_SNAPSHOT_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,111 @@
+"""Login session handling for SQC controllers."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+LOGIN_TIMEOUT = 10
+LOGIN_SUCCESS = "PIN prawidłowy"
+# A learned lifetime is never shorter than this, so an expiry caused by
+# something else, like a reboot of the device, does not cause a login on
+# every poll.
+MIN_LIFETIME = 30.0
+# Factor the lifetime grows by with every login before it ran out, so a
+# lifetime learned too short recovers.
+LIFETIME_GROWTH = 1.5
+
+
+class SQCAuthError(Exception):
+    """Error to indicate the device rejected the PIN."""
+
+
+class SQCSessionExpired(Exception):
+    """Error to indicate the device answered as if we were not logged in."""
+
+
+class SQCSession:
+    """Login state of a single SQC controller.
+
+    Only one login is in flight at a time. The session lifetime is learned
+    from observed expiries, so the next login can happen before the device
+    starts rejecting page requests. Every login ahead of the learned
+    lifetime lengthens it, until the device rejects the session again and
+    the lifetime is learned anew.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, host: str, pin: str) -> None:
+        """Initialize the session."""
+        self._session = session
+        self.host = host
+        self.pin = pin
+        self._lock = asyncio.Lock()
+        self._generation = 0
+        self._logged_in_at: float | None = None
+        self._valid_age: float | None = None
+        self.lifetime: float | None = None
+        self.login_count = 0
+
+    @property
+    def generation(self) -> int:
+        """Return a counter that increases with every successful login."""
+        return self._generation
+
+    @property
+    def expiring(self) -> bool:
+        """Return True if the session is about to expire."""
+        if self._logged_in_at is None or self.lifetime is None:
+            return False
+        return time.monotonic() - self._logged_in_at >= self.lifetime
+
+    def mark_valid(self) -> None:
+        """Record that a page request was accepted."""
+        if self._logged_in_at is not None:
+            self._valid_age = time.monotonic() - self._logged_in_at
+
+    def mark_expired(self) -> None:
+        """Record that the device no longer accepts the session."""
+        if self._valid_age is not None:
+            # The last accepted age is a safe lower bound for the lifetime.
+            self.lifetime = max(self._valid_age, MIN_LIFETIME)
+            _LOGGER.debug("Session on %s lasts about %.0fs", self.host, self.lifetime)
+        self._logged_in_at = None
+        self._valid_age = None
+
+    def record_login(self) -> None:
+        """Record a successful login."""
+        if self._logged_in_at is not None and self.lifetime is not None:
+            # The old session was still accepted, so it may last longer.
+            self.lifetime *= LIFETIME_GROWTH
+        self._logged_in_at = time.monotonic()
+        # Nothing was accepted yet; a rejection right after the login says
+        # nothing about the lifetime.
+        self._valid_age = None
+        self._generation += 1
+        self.login_count += 1
+
+    async def async_login(self, generation: int | None = None) -> None:
+        """Log in with the PIN.
+
+        If generation is given and another caller logged in since it was
+        read, the login is skipped.
+        """
+        async with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            async with self._session.post(
+                self.host,
+                data={"pin": self.pin},
+                timeout=aiohttp.ClientTimeout(total=LOGIN_TIMEOUT),
+            ) as res:
+                if res.status != 200:
+                    raise aiohttp.ClientError(f"Login failed with status {res.status}")
+                text = await res.text()
+            if LOGIN_SUCCESS not in text:
+                raise SQCAuthError(f"Login failed: {text}")
+            _LOGGER.info("Login successful")
+            self.record_login()
@@ -0,0 +1,93 @@
+"""Per-poll timing statistics for SQC."""
+from __future__ import annotations
+
+from collections import deque
+from statistics import fmean
+from typing import Any
+
+# Phases of a poll, in seconds. "request" runs until the response headers
+# arrived, so it includes "connect", which is zero on a kept-alive
+# connection, and the time to first byte.
+POLL_PHASES = ("request", "connect", "body", "decode", "parse", "login", "total")
+FAN_OUT = "fan_out"
+
+# Upper bounds of the histogram buckets, in milliseconds.
+HISTOGRAM_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class RollingHistogram:
+    """The most recent samples of one phase."""
+
+    def __init__(self, size: int) -> None:
+        """Initialize the histogram."""
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def add(self, value: float) -> None:
+        """Add a sample in seconds."""
+        self._samples.append(value)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary of the recent samples in milliseconds."""
+        if not self._samples:
+            return {"count": 0}
+        samples = sorted(value * 1000 for value in self._samples)
+        buckets = dict.fromkeys((f"<={bound}" for bound in HISTOGRAM_BUCKETS), 0)
+        buckets[f">{HISTOGRAM_BUCKETS[-1]}"] = 0
+        for value in samples:
+            for bound in HISTOGRAM_BUCKETS:
+                if value <= bound:
+                    buckets[f"<={bound}"] += 1
+                    break
+            else:
+                buckets[f">{HISTOGRAM_BUCKETS[-1]}"] += 1
+        return {
+            "count": len(samples),
+            "mean": round(fmean(samples), 2),
+            "p50": round(samples[len(samples) // 2], 2),
+            "p95": round(samples[min(len(samples) - 1, len(samples) * 95 // 100)], 2),
+            "max": round(samples[-1], 2),
+            "buckets": buckets,
+        }
+
+
+class PollStats:
+    """Timing and outcome of the most recent polls of one device."""
+
+    def __init__(self, size: int) -> None:
+        """Initialize the statistics."""
+        self.histograms = {phase: RollingHistogram(size) for phase in (*POLL_PHASES, FAN_OUT)}
+        self._results: deque[bool] = deque(maxlen=size)
+        self.last: dict[str, float] = {}
+        self.polls = 0
+        self.failures = 0
+
+    @property
+    def error_rate(self) -> float | None:
+        """Return the share of recent polls that failed."""
+        if not self._results:
+            return None
+        return self._results.count(False) / len(self._results)
+
+    def record(self, timings: dict[str, float], success: bool) -> None:
+        """Record the phases of one poll."""
+        self.polls += 1
+        if not success:
+            self.failures += 1
+        self._results.append(success)
+        self.last = timings
+        for phase, value in timings.items():
+            self.histograms[phase].add(value)
+
+    def add(self, phase: str, value: float) -> None:
+        """Record a phase measured outside of a poll."""
+        self.histograms[phase].add(value)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics for diagnostics."""
+        return {
+            "polls": self.polls,
+            "failures": self.failures,
+            "error_rate": self.error_rate,
+            "last_poll_ms": {phase: round(value * 1000, 2) for phase, value in self.last.items()},
+            "phases": {phase: histogram.as_dict() for phase, histogram in self.histograms.items()},
+        }
@@ -0,0 +1,132 @@
+"""Load benchmark of SQCDataUpdateCoordinator against simulated devices.
+
+Starts simulated controllers (see sqc_simulator.py), polls every one of
+them through its own coordinator for a number of rounds and reports polls
+per second, latency percentiles, memory and the reasons of failed polls.
+Home Assistant core must be importable, for example from a core
+development checkout; it was last run against 2025.4.
+
+    python scripts/sqc_benchmark.py --devices 50 --rounds 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from types import MappingProxyType
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.const import CONF_HOST, CONF_PIN  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import device_registry as dr  # noqa: E402
+
+from sqc_simulator import add_device_arguments, async_start_devices, device_config  # noqa: E402
+
+const = importlib.import_module("custom_components.ha-sqc.const")
+coordinator_module = importlib.import_module("custom_components.ha-sqc.coordinator")
+hub_module = importlib.import_module("custom_components.ha-sqc.hub")
+
+
+def _config_entry(url: str, pin: str) -> ConfigEntry:
+    """Return a config entry for a simulated device."""
+    return ConfigEntry(
+        data={CONF_HOST: url, CONF_PIN: pin},
+        discovery_keys=MappingProxyType({}),
+        domain=const.DOMAIN,
+        minor_version=1,
+        options={},
+        source="user",
+        subentries_data=None,
+        title=url,
+        unique_id=url,
+        version=1,
+    )
+
+
+async def _async_start_hass(config_dir: str) -> HomeAssistant:
+    """Return a Home Assistant instance with what the coordinators use."""
+    hass = HomeAssistant(config_dir)
+    # Coordinators rename their device once its title is known.
+    await dr.async_load(hass)
+    return hass
+
+
+async def _async_run(args: argparse.Namespace) -> None:
+    """Run the benchmark and print a report."""
+    devices, runners, urls = await async_start_devices(
+        args.devices, device_config(args), args.host, args.base_port
+    )
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await _async_start_hass(config_dir)
+        hub = hub_module.SQCHub(hass)
+        coordinators = [
+            coordinator_module.SQCDataUpdateCoordinator(hass, _config_entry(url, args.pin), hub)
+            for url in urls
+        ]
+
+        latencies: list[float] = []
+        # A broken setup shows up here rather than as slow polls.
+        failures: Counter[str] = Counter()
+        examples: dict[str, str] = {}
+
+        async def _async_poll(coordinator) -> None:
+            start = time.perf_counter()
+            await coordinator.async_refresh()
+            latencies.append(time.perf_counter() - start)
+            if not coordinator.last_update_success:
+                error = coordinator.last_exception
+                failures[type(error).__name__] += 1
+                examples.setdefault(type(error).__name__, str(error))
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            await asyncio.gather(*(_async_poll(coordinator) for coordinator in coordinators))
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        connections = sum(coordinator.client.connections["opened"] for coordinator in coordinators)
+        unchanged = sum(coordinator.client.page_results["unchanged"] for coordinator in coordinators)
+        for coordinator in coordinators:
+            await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+
+    for runner in runners:
+        await runner.cleanup()
+
+    percentiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    print(f"devices:      {args.devices}")
+    print(f"polls:        {len(latencies)} ({failures.total()} failed)")
+    print(f"polls/s:      {len(latencies) / elapsed:.1f}")
+    print(f"latency p50:  {percentiles[49] * 1000:.1f} ms")
+    print(f"latency p99:  {percentiles[98] * 1000:.1f} ms")
+    print(f"logins:       {sum(device.logins for device in devices)}")
+    print(f"requests:     {sum(device.requests for device in devices)}")
+    print(f"connections:  {connections}")
+    print(f"unchanged:    {unchanged} pages")
+    print(f"peak memory:  {peak / 1024:.0f} KiB")
+    for name, count in failures.most_common():
+        print(f"failed:       {count}x {name}, e.g. {examples[name]}")
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_device_arguments(parser)
+    parser.add_argument("--rounds", type=int, default=10, help="polls per device")
+    asyncio.run(_async_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Poll SQC controllers and print every reading as a line of JSON.
+
+Uses the integration's asyncio client without Home Assistant. Each host
+is polled concurrently on its own connection; every poll prints one JSON
+object, with the readings or the error, to stdout.
+
+    python scripts/sqc_client.py 192.168.1.50 192.168.1.51=4321 --pin 1234
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import sys
+import time
+import types
+from datetime import datetime, timezone
+from pathlib import Path
+
+PACKAGE = Path(__file__).resolve().parent.parent / "custom_components" / "ha-sqc"
+
+
+def _load_client() -> types.ModuleType:
+    """Import the client without the Home Assistant parts of the integration."""
+    package = types.ModuleType("sqc")
+    package.__path__ = [str(PACKAGE)]
+    sys.modules["sqc"] = package
+    return importlib.import_module("sqc.client")
+
+
+client_module = _load_client()
+
+
+def _emit(record: dict) -> None:
+    """Write one line of JSON."""
+    sys.stdout.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+    sys.stdout.flush()
+
+
+async def _async_poll_host(
+    host: str, pin: str, fields: set[str] | None, interval: float, count: int
+) -> None:
+    """Poll one controller count times, or until cancelled if count is 0."""
+    if not host.startswith(("http://", "https://")):
+        host = f"http://{host}"
+    client = client_module.SQCClient(host, pin)
+    loop = asyncio.get_running_loop()
+    next_poll = loop.time()
+    polls = 0
+    try:
+        while True:
+            start = time.perf_counter()
+            record: dict = {"time": datetime.now(timezone.utc).isoformat(), "host": host}
+            try:
+                snapshot = await client.async_fetch_snapshot(fields)
+            except Exception as err:  # noqa: BLE001
+                record["error"] = f"{type(err).__name__}: {err}"
+            else:
+                record.update(
+                    (key, value)
+                    for key, value in snapshot.as_dict().items()
+                    if fields is None or key in fields
+                )
+            record["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            _emit(record)
+            polls += 1
+            if polls == count:
+                break
+            next_poll += interval
+            await asyncio.sleep(max(0.0, next_poll - loop.time()))
+    finally:
+        await client.async_close()
+
+
+async def _async_run(args: argparse.Namespace) -> None:
+    """Poll every host concurrently."""
+    fields = set(args.fields.split(",")) if args.fields else None
+    tasks = []
+    for target in args.hosts:
+        host, _, pin = target.partition("=")
+        tasks.append(_async_poll_host(host, pin or args.pin, fields, args.interval, args.count))
+    await asyncio.gather(*tasks)
+
+
+def main() -> None:
+    """Parse arguments and poll until done or interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("hosts", nargs="+", metavar="HOST[=PIN]")
+    parser.add_argument("--pin", help="PIN of hosts given without one")
+    parser.add_argument("--interval", type=float, default=30.0, help="seconds between polls")
+    parser.add_argument("--count", type=int, default=0, help="polls per host, 0 polls forever")
+    parser.add_argument("--fields", help="comma separated fields to read, default all")
+    # Readings go to stdout, log messages to stderr.
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+    args = parser.parse_args()
+    if args.pin is None and not all(target.partition("=")[2] for target in args.hosts):
+        parser.error("--pin is required for hosts given without =PIN")
+    try:
+        asyncio.run(_async_run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
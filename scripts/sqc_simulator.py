@@ -0,0 +1,253 @@
+"""Simulated SeaQuaComp controllers for offline testing.
+
+Each simulated device serves the parts of the web UI the integration uses:
+the login page on GET /, a PIN login on POST /, the /home page with live
+readings, and the non-HTTP answer a device gives once the login session
+has expired. Latency, dropped connections and slow bodies can be
+configured to reproduce a struggling controller.
+
+    python scripts/sqc_simulator.py --devices 5 --base-port 8100
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from aiohttp import web
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+</head>
+<body>
+<h1>{title}</h1>
+<p>Temperatura = {temperature:.1f}ºC</p>
+<p>pH = {ph:.2f} [pH]</p>
+<p>CO<sub>2</sub> = <b>{co2:.1f} ppm</b></p>
+<p>Alarm: <b>{alarm}</b></p>
+<p>Sterowanie pH:  <b>{ph_control}</b></p>
+<p>Licznik CO<sub>2</sub>: <b>{co2_counter:.1f} godz.</b></p>
+<p>Data restartu CO<sub>2</sub>:</br>{co2_restart}</p>
+{padding}
+</body>
+</html>
+"""
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+</head>
+<body>
+<form method="post" action="/">
+PIN: <input type="password" name="pin" maxlength="4">
+<input type="submit" value="Zaloguj">
+</form>
+</body>
+</html>
+"""
+LOGIN_OK = "<html><body>PIN prawidłowy</body></html>"
+LOGIN_FAILED = "<html><body>PIN nieprawidłowy</body></html>"
+# What a device sends to a client whose session expired.
+NOT_LOGGED_IN = b"Zaloguj sie\r\n"
+
+
+@dataclass
+class DeviceConfig:
+    """Behaviour of a simulated device."""
+
+    pin: str = "1234"
+    title: str = "SQCmini 3"
+    session_ttl: float = 300.0
+    latency: float = 0.0
+    drop_rate: float = 0.0
+    slow_body: float = 0.0
+    change_rate: float = 0.2
+    alarm_rate: float = 0.0
+    padding: int = 4096
+
+
+@dataclass
+class SimulatedDevice:
+    """A single simulated SeaQuaComp controller."""
+
+    config: DeviceConfig = field(default_factory=DeviceConfig)
+    temperature: float = 25.0
+    ph: float = 6.8
+    co2: float = 25.0
+    co2_counter: float = 0.0
+    alarm: str = "brak"
+    ph_control: bool = True
+    co2_restart: datetime = field(default_factory=lambda: datetime.now().replace(second=0, microsecond=0))
+    sessions: dict[str, float] = field(default_factory=dict)
+    requests: int = 0
+    logins: int = 0
+
+    def app(self) -> web.Application:
+        """Return the web application of this device."""
+        app = web.Application()
+        app.router.add_get("/", self.handle_login_page)
+        app.router.add_post("/", self.handle_login)
+        app.router.add_get("/home", self.handle_home)
+        return app
+
+    def _step(self) -> None:
+        """Move the readings, or leave them alone most of the time."""
+        if random.random() < self.config.change_rate:
+            self.temperature += random.uniform(-0.1, 0.1)
+            self.ph += random.uniform(-0.02, 0.02)
+            self.co2 += random.uniform(-0.5, 0.5)
+            self.co2_counter += 0.1
+        if random.random() < self.config.alarm_rate:
+            self.alarm = "ph za niskie" if self.alarm == "brak" else "brak"
+
+    async def _misbehave(self, request: web.Request) -> bool:
+        """Apply latency and drops, return True if the connection was dropped."""
+        self.requests += 1
+        if self.config.latency:
+            await asyncio.sleep(random.expovariate(1 / self.config.latency))
+        if random.random() < self.config.drop_rate:
+            if request.transport is not None:
+                request.transport.close()
+            return True
+        return False
+
+    async def handle_login_page(self, request: web.Request) -> web.StreamResponse:
+        """Serve the form asking for the PIN."""
+        if await self._misbehave(request):
+            return web.Response()
+        return web.Response(
+            text=LOGIN_PAGE.format(title=self.config.title), content_type="text/html"
+        )
+
+    async def handle_login(self, request: web.Request) -> web.StreamResponse:
+        """Check the PIN and start a session for the client."""
+        if await self._misbehave(request):
+            return web.Response()
+        data = await request.post()
+        if data.get("pin") != self.config.pin:
+            return web.Response(text=LOGIN_FAILED, content_type="text/html")
+        self.logins += 1
+        self.sessions[request.remote or ""] = time.monotonic()
+        return web.Response(text=LOGIN_OK, content_type="text/html")
+
+    def _logged_in(self, request: web.Request) -> bool:
+        """Return True if the client has a session, ending expired ones."""
+        logged_in_at = self.sessions.get(request.remote or "")
+        if logged_in_at is None or time.monotonic() - logged_in_at > self.config.session_ttl:
+            self.sessions.pop(request.remote or "", None)
+            if request.transport is not None:
+                request.transport.write(NOT_LOGGED_IN)
+                request.transport.close()
+            return False
+        return True
+
+    async def handle_home(self, request: web.Request) -> web.StreamResponse:
+        """Serve the home page, or garbage once the session expired."""
+        if await self._misbehave(request) or not self._logged_in(request):
+            return web.Response()
+
+        self._step()
+        body = PAGE_TEMPLATE.format(
+            title=self.config.title,
+            temperature=self.temperature,
+            ph=self.ph,
+            co2=self.co2,
+            alarm=self.alarm.upper(),
+            ph_control="ON" if self.ph_control else "OFF",
+            co2_counter=self.co2_counter,
+            co2_restart=self.co2_restart.strftime("%Y-%m-%d %H:%M"),
+            padding="<!-- " + "x" * self.config.padding + " -->",
+        ).encode()
+
+        response = web.StreamResponse(headers={"Content-Type": "text/html; charset=utf-8"})
+        response.content_length = len(body)
+        await response.prepare(request)
+        chunks = [body[i : i + 512] for i in range(0, len(body), 512)]
+        for chunk in chunks:
+            if self.config.slow_body:
+                await asyncio.sleep(self.config.slow_body / len(chunks))
+            await response.write(chunk)
+        await response.write_eof()
+        return response
+
+
+async def async_start_devices(
+    count: int, config: DeviceConfig, host: str = "127.0.0.1", base_port: int = 8100
+) -> tuple[list[SimulatedDevice], list[web.AppRunner], list[str]]:
+    """Start count devices on consecutive ports, return them with their URLs."""
+    devices: list[SimulatedDevice] = []
+    runners: list[web.AppRunner] = []
+    urls: list[str] = []
+    for index in range(count):
+        device = SimulatedDevice(config=config)
+        runner = web.AppRunner(device.app(), access_log=None, handle_signals=False)
+        await runner.setup()
+        await web.TCPSite(runner, host, base_port + index).start()
+        devices.append(device)
+        runners.append(runner)
+        urls.append(f"http://{host}:{base_port + index}")
+    return devices, runners, urls
+
+
+def add_device_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options that describe simulated devices."""
+    defaults = DeviceConfig()
+    parser.add_argument("--devices", type=int, default=1, help="number of devices")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--base-port", type=int, default=8100)
+    parser.add_argument("--pin", default=defaults.pin)
+    parser.add_argument("--session-ttl", type=float, default=defaults.session_ttl, help="seconds a login lasts")
+    parser.add_argument("--latency", type=float, default=defaults.latency, help="mean response delay in seconds")
+    parser.add_argument("--drop-rate", type=float, default=defaults.drop_rate, help="share of dropped connections")
+    parser.add_argument("--slow-body", type=float, default=defaults.slow_body, help="seconds to send one page body")
+    parser.add_argument("--change-rate", type=float, default=defaults.change_rate, help="share of polls with new readings")
+    parser.add_argument("--alarm-rate", type=float, default=defaults.alarm_rate, help="share of polls that toggle the alarm")
+
+
+def device_config(args: argparse.Namespace) -> DeviceConfig:
+    """Build a device configuration from parsed arguments."""
+    return DeviceConfig(
+        pin=args.pin,
+        session_ttl=args.session_ttl,
+        latency=args.latency,
+        drop_rate=args.drop_rate,
+        slow_body=args.slow_body,
+        change_rate=args.change_rate,
+        alarm_rate=args.alarm_rate,
+    )
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    """Run the simulated devices until interrupted."""
+    _, runners, urls = await async_start_devices(
+        args.devices, device_config(args), args.host, args.base_port
+    )
+    for url in urls:
+        print(url)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for runner in runners:
+            await runner.cleanup()
+
+
+def main() -> None:
+    """Parse arguments and run the simulator."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_device_arguments(parser)
+    try:
+        asyncio.run(_async_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
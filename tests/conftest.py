@@ -0,0 +1,41 @@
+"""Fixtures for the SQC tests."""
+from __future__ import annotations
+
+import importlib
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+PACKAGE = Path(__file__).resolve().parent.parent / "custom_components" / "ha-sqc"
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+def load_module(module: str) -> types.ModuleType:
+    """Import a module of the integration without its Home Assistant parts."""
+    if "sqc" not in sys.modules:
+        package = types.ModuleType("sqc")
+        package.__path__ = [str(PACKAGE)]
+        sys.modules["sqc"] = package
+    return importlib.import_module(f"sqc.{module}")
+
+
+parser = load_module("parser")
+
+
+def load_fixture(name: str) -> str:
+    """Return a page of tests/fixtures, in the markup of an SQCmini 3."""
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+@pytest.fixture
+def home_page() -> str:
+    """Return the home page of a device without an alarm."""
+    return load_fixture("home_ok.html")
+
+
+@pytest.fixture
+def alarm_page() -> str:
+    """Return the home page of a device showing an alarm."""
+    return load_fixture("home_alarm.html")
@@ -0,0 +1,89 @@
+"""Tests for the circuit breaker of unreachable SQC controllers."""
+from __future__ import annotations
+
+from conftest import load_module
+
+breaker = load_module("breaker")
+BreakerState = breaker.BreakerState
+
+
+def _open(now: float = 0.0) -> breaker.CircuitBreaker:
+    """Return a breaker opened by three failures at now."""
+    circuit = breaker.CircuitBreaker(3, 10, 60)
+    for _ in range(3):
+        circuit.record_failure(now)
+    return circuit
+
+
+def test_threshold() -> None:
+    """Test that the breaker opens after threshold failures in a row."""
+    circuit = breaker.CircuitBreaker(3, 10, 60)
+    for _ in range(2):
+        circuit.record_failure(0.0)
+        assert circuit.state is BreakerState.CLOSED
+        assert circuit.allow_request(0.0)
+
+    circuit.record_failure(5.0)
+    assert circuit.state is BreakerState.OPEN
+    assert circuit.next_probe == 15.0
+    assert not circuit.allow_request(14.9)
+
+
+def test_success_resets_count() -> None:
+    """Test that a success between failures keeps the breaker closed."""
+    circuit = breaker.CircuitBreaker(3, 10, 60)
+    for _ in range(2):
+        circuit.record_failure(0.0)
+    circuit.record_success()
+    for _ in range(2):
+        circuit.record_failure(0.0)
+
+    assert circuit.state is BreakerState.CLOSED
+    assert circuit.failures == 2
+
+
+def test_half_open_probe() -> None:
+    """Test that a probe is let through once the delay passed."""
+    circuit = _open()
+
+    assert not circuit.allow_request(9.9)
+    assert circuit.state is BreakerState.OPEN
+    assert circuit.allow_request(10.0)
+    assert circuit.state is BreakerState.HALF_OPEN
+
+
+def test_failed_probe_doubles_delay_up_to_cap() -> None:
+    """Test the backoff of failed probes and its upper bound."""
+    circuit = _open()
+    delays = []
+    for _ in range(5):
+        now = circuit.next_probe
+        assert circuit.allow_request(now)
+        circuit.record_failure(now)
+        assert circuit.state is BreakerState.OPEN
+        delays.append(circuit.next_probe - now)
+
+    assert delays == [20, 40, 60, 60, 60]
+    assert circuit.delay == 60
+
+
+def test_success_resets() -> None:
+    """Test that a successful probe closes the breaker and resets the delay."""
+    circuit = _open()
+    for _ in range(2):
+        assert circuit.allow_request(circuit.next_probe)
+        circuit.record_failure(circuit.next_probe)
+
+    assert circuit.allow_request(circuit.next_probe)
+    circuit.record_success()
+
+    assert circuit.state is BreakerState.CLOSED
+    assert circuit.failures == 0
+    assert circuit.delay == 10
+    assert circuit.next_probe is None
+    # It takes threshold failures again to open it.
+    for _ in range(2):
+        circuit.record_failure(100.0)
+    assert circuit.state is BreakerState.CLOSED
+    circuit.record_failure(100.0)
+    assert circuit.next_probe == 110.0
@@ -0,0 +1,49 @@
+"""Tests for the spike filters of the SQC readings."""
+from __future__ import annotations
+
+import pytest
+
+from conftest import load_module
+
+filters = load_module("filters")
+
+
+def test_median() -> None:
+    """Test that the median filter follows the middle of the window."""
+    median = filters.MedianFilter(3)
+
+    assert [median.update(value) for value in (7.0, 9.0, 8.0, 1.0, 2.0)] == [
+        7.0,
+        8.0,
+        8.0,
+        8.0,
+        2.0,
+    ]
+
+
+def test_hampel_spike() -> None:
+    """Test that a spike in noisy readings is replaced by the median."""
+    hampel = filters.HampelFilter(5, 0.01)
+    for value in (6.84, 6.86, 6.85, 6.84):
+        assert hampel.update(value) == value
+
+    assert hampel.update(8.5) == pytest.approx(6.85)
+
+
+@pytest.mark.parametrize("resolution", [0.0, 0.01])
+def test_hampel_small_step_of_equal_readings(resolution: float) -> None:
+    """Test that equal readings do not turn a small step into an outlier."""
+    hampel = filters.HampelFilter(5, resolution)
+    for _ in range(5):
+        hampel.update(6.85)
+
+    assert hampel.update(6.87) == 6.87
+
+
+def test_hampel_spike_of_equal_readings() -> None:
+    """Test that a spike is still replaced after equal readings."""
+    hampel = filters.HampelFilter(5, 0.1)
+    for _ in range(5):
+        hampel.update(23.4)
+
+    assert hampel.update(40.0) == 23.4
@@ -0,0 +1,124 @@
+"""Tests for the aggregates over all SQC controllers."""
+from __future__ import annotations
+
+import random
+import statistics
+
+import pytest
+
+from conftest import load_module
+
+fleet = load_module("fleet")
+models = load_module("models")
+
+
+def _snapshot(ph: float | None, alarm: str | None = "brak") -> models.SQCSnapshot:
+    """Return a snapshot with a pH reading."""
+    return models.SQCSnapshot(ph=ph, alarm=alarm)
+
+
+def _assert_reading(reading: fleet.FleetReading, values: list[float]) -> None:
+    """Assert that a reading aggregates exactly values."""
+    assert reading.count == len(values)
+    if not values:
+        assert reading.minimum is None
+        assert reading.maximum is None
+        assert reading.mean is None
+        return
+    assert reading.minimum == min(values)
+    assert reading.maximum == max(values)
+    assert reading.mean == pytest.approx(statistics.fmean(values))
+
+
+def test_value_changes() -> None:
+    """Test that the old value of a changed device is forgotten."""
+    reading = fleet.FleetReading()
+    reading.set("a", 6.5)
+    reading.set("b", 7.0)
+    reading.set("a", 7.5)
+
+    _assert_reading(reading, [7.5, 7.0])
+
+    reading.set("a", 6.9)
+    _assert_reading(reading, [6.9, 7.0])
+
+
+def test_old_value_comes_back() -> None:
+    """Test that a value equal to an outdated heap entry counts once."""
+    reading = fleet.FleetReading()
+    reading.set("a", 6.5)
+    reading.set("b", 7.0)
+    reading.set("a", 8.0)
+    reading.set("a", None)
+    reading.set("a", 6.5)
+
+    _assert_reading(reading, [6.5, 7.0])
+
+    reading.set("a", 7.2)
+    _assert_reading(reading, [7.2, 7.0])
+
+
+def test_random_updates() -> None:
+    """Test the aggregates against a reference through many updates."""
+    reading = fleet.FleetReading()
+    rng = random.Random(25)
+    values: dict[str, float] = {}
+    for _ in range(2000):
+        device = f"device{rng.randrange(6)}"
+        if rng.random() < 0.2:
+            reading.set(device, None)
+            values.pop(device, None)
+        else:
+            # Few distinct values, so old values come back often.
+            value = rng.choice((6.5, 6.8, 7.0, 7.2))
+            reading.set(device, value)
+            values[device] = value
+
+        _assert_reading(reading, list(values.values()))
+
+
+def test_device_leaves() -> None:
+    """Test that a removed device is dropped everywhere."""
+    sqc = fleet.SQCFleet()
+    sqc.update("a", _snapshot(6.5, "ph za niskie"), True)
+    sqc.update("b", _snapshot(7.0), False)
+    sqc.update("c", _snapshot(7.5), True)
+
+    sqc.remove("a")
+    sqc.remove("b")
+
+    assert sqc.devices == {"c"}
+    assert sqc.in_alarm == set()
+    assert sqc.offline == set()
+    _assert_reading(sqc.readings["ph"], [7.5])
+
+
+def test_device_offline_and_back() -> None:
+    """Test that an offline device is left out until it is back."""
+    sqc = fleet.SQCFleet()
+    sqc.update("a", _snapshot(6.5), True)
+    sqc.update("b", _snapshot(7.0, "ph za niskie"), True)
+    assert sqc.in_alarm == {"b"}
+
+    # The coordinator still holds the last snapshot of an offline device.
+    sqc.update("b", _snapshot(7.0, "ph za niskie"), False)
+    assert sqc.offline == {"b"}
+    assert sqc.in_alarm == set()
+    _assert_reading(sqc.readings["ph"], [6.5])
+
+    # Back with the value it had before it went offline.
+    sqc.update("b", _snapshot(7.0), True)
+    assert sqc.offline == set()
+    assert sqc.devices == {"a", "b"}
+    _assert_reading(sqc.readings["ph"], [6.5, 7.0])
+    _assert_reading(sqc.readings["temperature"], [])
+
+
+def test_missing_reading() -> None:
+    """Test that a device without a reading is not counted for it."""
+    sqc = fleet.SQCFleet()
+    sqc.update("a", _snapshot(6.5), True)
+    sqc.update("b", _snapshot(None, None), True)
+
+    _assert_reading(sqc.readings["ph"], [6.5])
+    assert sqc.in_alarm == set()
@@ -0,0 +1,121 @@
+"""Tests for the rolling statistics of SQC readings."""
+from __future__ import annotations
+
+import random
+import statistics
+
+import pytest
+
+from conftest import load_module
+
+history = load_module("history")
+
+
+def _reference(
+    samples: list[tuple[float, float]], size: int, window: float, now: float
+) -> list[tuple[float, float]]:
+    """Return the samples a series of size and window should hold at now."""
+    kept = samples[-size:]
+    return [(when, value) for when, value in kept if when >= now - window]
+
+
+def _assert_matches(series: history.RollingSeries, kept: list[tuple[float, float]]) -> None:
+    """Assert that the statistics of series are those of the kept samples."""
+    times = [when for when, _ in kept]
+    values = [value for _, value in kept]
+    assert len(series) == len(kept)
+    assert series.mean == pytest.approx(statistics.fmean(values))
+    assert series.minimum == min(values)
+    assert series.maximum == max(values)
+    if len(kept) >= 2:
+        assert series.stdev == pytest.approx(statistics.stdev(values), abs=1e-9)
+        slope, _ = statistics.linear_regression(times, values)
+        assert series.slope == pytest.approx(slope * 3600, rel=1e-6, abs=1e-9)
+
+
+def test_empty() -> None:
+    """Test that an empty series has no statistics."""
+    series = history.RollingSeries(8, 600)
+
+    assert len(series) == 0
+    assert series.mean is None
+    assert series.stdev is None
+    assert series.minimum is None
+    assert series.maximum is None
+    assert series.slope is None
+
+
+def test_single_sample() -> None:
+    """Test that one sample has a mean but no spread or trend."""
+    series = history.RollingSeries(8, 600)
+    series.add(100.0, 6.8)
+
+    assert series.mean == 6.8
+    assert series.minimum == series.maximum == 6.8
+    assert series.stdev is None
+    assert series.slope is None
+
+
+def test_window_expiry() -> None:
+    """Test that samples older than the window are dropped."""
+    series = history.RollingSeries(100, 60)
+    for when in range(0, 100, 10):
+        series.add(float(when), float(when))
+
+    # Samples from 30 to 90 seconds are within 60 seconds of the last one.
+    assert len(series) == 7
+    assert series.minimum == 30.0
+    assert series.maximum == 90.0
+
+    series.expire(200.0)
+    assert len(series) == 0
+    assert series.mean is None
+
+
+def test_slope_per_hour() -> None:
+    """Test that a steady rise is reported per hour."""
+    series = history.RollingSeries(100, 3600)
+    for minute in range(10):
+        series.add(minute * 60.0, 6.5 + minute * 0.01)
+
+    assert series.slope == pytest.approx(0.6)
+
+
+def test_same_time() -> None:
+    """Test that samples all taken at one time have no trend."""
+    series = history.RollingSeries(8, 600)
+    series.add(100.0, 6.8)
+    series.add(100.0, 6.9)
+
+    assert series.slope is None
+    assert series.mean == pytest.approx(6.85)
+
+
+def test_wraparound_and_rebase() -> None:
+    """Test the statistics against a reference across many wraparounds."""
+    size, window = 16, 300.0
+    series = history.RollingSeries(size, window)
+    rng = random.Random(1234)
+    samples: list[tuple[float, float]] = []
+    # Start far from zero, as the monotonic clock does.
+    now = 1_000_000.0
+    for _ in range(40 * size):
+        now += rng.choice((5.0, 10.0, 30.0, 120.0))
+        value = round(6.8 + rng.gauss(0, 0.2) + (now - 1_000_000.0) * 1e-5, 2)
+        series.add(now, value)
+        samples.append((now, value))
+
+        _assert_matches(series, _reference(samples, size, window, now))
+
+
+def test_refill_after_empty() -> None:
+    """Test that a series emptied by the window starts over cleanly."""
+    series = history.RollingSeries(4, 60)
+    for when in range(0, 50, 10):
+        series.add(float(when), 100.0)
+    series.expire(1000.0)
+
+    series.add(1000.0, 6.8)
+    series.add(1010.0, 6.9)
+
+    _assert_matches(series, [(1000.0, 6.8), (1010.0, 6.9)])
@@ -0,0 +1,125 @@
+"""Tests for the SQC home page parser."""
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from conftest import parser
+
+NOT_LOGGED_IN = "Zaloguj sie\r\n"
+
+
+def test_every_field(home_page: str) -> None:
+    """Test every field of a page without an alarm."""
+    snapshot = parser.parse_home_page(home_page)
+
+    assert snapshot.title == "SQCmini 3"
+    assert snapshot.temperature == 24.8
+    assert snapshot.ph == 6.85
+    assert snapshot.co2 == 23.4
+    assert snapshot.alarm == "brak"
+    assert snapshot.ph_control is True
+    assert snapshot.co2_counter == 1234.5
+    assert snapshot.co2_restart is not None
+    assert snapshot.co2_restart.replace(tzinfo=None) == datetime(2024, 3, 1, 8, 15)
+    assert snapshot.co2_restart.tzinfo is not None
+
+
+def test_alarm_page(alarm_page: str) -> None:
+    """Test an alarm of several words and pH control switched off."""
+    snapshot = parser.parse_home_page(alarm_page)
+
+    assert snapshot.title == "Akwarium salon"
+    assert snapshot.alarm == "ph za niskie"
+    assert snapshot.ph_control is False
+    assert snapshot.co2_counter == 12.0
+
+
+def test_every_field_is_known(home_page: str) -> None:
+    """Test that the fixture covers every field the parser knows."""
+    page = parser.SQCPageParser()
+    page.feed(home_page)
+
+    assert page.done
+    assert None not in page.values().values()
+
+
+def test_requested_fields_only(home_page: str) -> None:
+    """Test that fields that were not requested are not parsed."""
+    snapshot = parser.parse_home_page(home_page, {"ph", "alarm"})
+
+    assert snapshot.ph == 6.85
+    assert snapshot.alarm == "brak"
+    assert snapshot.temperature is None
+    assert snapshot.title is None
+
+
+@pytest.mark.parametrize(
+    ("field", "old", "new"),
+    [
+        ("temperature", "Temperatura = 24.8ºC", "Temperatura = ---ºC"),
+        ("ph", "pH = 6.85 [pH]", ""),
+        ("co2", "<b>23.4 ppm</b>", "<b>-- ppm</b>"),
+        ("alarm", "<b>BRAK</b>", "<b></b>"),
+        ("ph_control", "<b>ON</b>", "<b>AUTO</b>"),
+        ("co2_counter", "Licznik CO<sub>2</sub>", "Licznik"),
+        ("title", "<title>SQCmini 3</title>", ""),
+    ],
+)
+def test_missing_field(home_page: str, field: str, old: str, new: str) -> None:
+    """Test that a field that is missing or not recognized is None."""
+    assert old in home_page
+    snapshot = parser.parse_home_page(home_page.replace(old, new))
+
+    assert getattr(snapshot, field) is None
+    assert snapshot.co2_restart is not None
+
+
+@pytest.mark.parametrize(
+    ("field", "old", "new"),
+    [
+        ("temperature", "24.8ºC", "24.8.1ºC"),
+        ("ph", "6.85 [pH]", "6..85 [pH]"),
+        ("co2_counter", "1234.5 godz.", "12.34.5 godz."),
+        ("co2_restart", "2024-03-01 08:15", "2024-13-01 08:15"),
+    ],
+)
+def test_garbled_field(
+    home_page: str, field: str, old: str, new: str, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test that a value that does not convert is None and logged."""
+    snapshot = parser.parse_home_page(home_page.replace(old, new))
+
+    assert getattr(snapshot, field) is None
+    assert f"Failed to parse {field}" in caplog.text
+    assert snapshot.alarm == "brak"
+
+
+def test_first_match_wins(home_page: str) -> None:
+    """Test that a repeated field keeps its first value."""
+    page = home_page.replace("</body>", "<p>Temperatura = 99.9ºC</p>\n</body>")
+
+    assert parser.parse_home_page(page).temperature == 24.8
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 512])
+def test_chunked(home_page: str, alarm_page: str, chunk_size: int) -> None:
+    """Test that fields split across chunks are found."""
+    for page in (home_page, alarm_page):
+        parser_ = parser.SQCPageParser()
+        for start in range(0, len(page), chunk_size):
+            parser_.feed(page[start : start + chunk_size])
+
+        assert parser_.is_page
+        assert parser_.snapshot() == parser.parse_home_page(page)
+
+
+def test_not_a_page() -> None:
+    """Test what a device sends once the session expired."""
+    page = parser.SQCPageParser()
+    page.feed(NOT_LOGGED_IN)
+
+    assert not page.is_page
+    assert not page.done
+    assert page.snapshot() == parser.SQCSnapshot()
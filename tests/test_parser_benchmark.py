@@ -0,0 +1,62 @@
+"""Benchmarks of parsing the SQC home page.
+
+Run with pytest-benchmark installed, for example to compare against a
+saved run:
+
+    pytest tests/test_parser_benchmark.py --benchmark-autosave
+    pytest tests/test_parser_benchmark.py --benchmark-compare --benchmark-compare-fail=mean:25%
+"""
+from __future__ import annotations
+
+import pytest
+
+from conftest import parser
+
+pytest.importorskip("pytest_benchmark")
+
+CHUNK_SIZE = 512
+LIVE_FIELDS = {"temperature", "ph", "co2", "alarm", "ph_control"}
+# The device pads its pages; parse cost should not grow with the padding
+# once every field was found.
+PADDING = "<!-- " + "x" * 16384 + " -->\n"
+
+
+def _padded(page: str) -> str:
+    """Return page with padding after the fields."""
+    return page.replace("</body>", f"{PADDING}</body>")
+
+
+def _parse_chunks(chunks: list[str], fields: set[str] | None) -> parser.SQCPageParser:
+    """Feed chunks until every field was found, like the client does."""
+    page = parser.SQCPageParser(fields)
+    for chunk in chunks:
+        page.feed(chunk)
+        if page.done:
+            break
+    return page
+
+
+def test_parse_page(benchmark, home_page: str) -> None:
+    """Benchmark parsing every field of a page in one piece."""
+    snapshot = benchmark(parser.parse_home_page, home_page)
+
+    assert snapshot.temperature == 24.8
+
+
+def test_parse_live_fields(benchmark, home_page: str) -> None:
+    """Benchmark parsing only the fields read on every poll."""
+    snapshot = benchmark(parser.parse_home_page, home_page, LIVE_FIELDS)
+
+    assert snapshot.title is None
+    assert snapshot.alarm == "brak"
+
+
+@pytest.mark.parametrize("fields", [None, LIVE_FIELDS], ids=["all", "live"])
+def test_parse_chunks(benchmark, home_page: str, fields: set[str] | None) -> None:
+    """Benchmark parsing a padded page as it streams in."""
+    page = _padded(home_page)
+    chunks = [page[start : start + CHUNK_SIZE] for start in range(0, len(page), CHUNK_SIZE)]
+
+    result = benchmark(_parse_chunks, chunks, fields)
+
+    assert result.done
@@ -0,0 +1,97 @@
+"""Tests for the session lifetime of an SQC controller."""
+from __future__ import annotations
+
+import pytest
+
+from conftest import load_module
+
+session = load_module("session")
+
+
+class Clock:
+    """A monotonic clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        """Initialize the clock."""
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    """Replace the clock of the session module."""
+    clock = Clock()
+    monkeypatch.setattr(session.time, "monotonic", clock)
+    return clock
+
+
+def _poll(sqc: session.SQCSession, expires_after: float | None) -> None:
+    """Poll like the client, with a device that ends sessions of that age."""
+    if sqc.expiring:
+        sqc.record_login()
+    age = session.time.monotonic() - sqc._logged_in_at
+    if expires_after is not None and age > expires_after:
+        sqc.mark_expired()
+        sqc.record_login()
+    sqc.mark_valid()
+
+
+def test_lifetime_learned(clock: Clock) -> None:
+    """Test that an expiry sets the lifetime to the last accepted age."""
+    sqc = session.SQCSession(None, "http://sqc", "1234")
+    sqc.record_login()
+    for _ in range(12):
+        clock.now += 10
+        _poll(sqc, 115)
+
+    assert sqc.lifetime == 110
+    assert sqc.login_count == 2
+
+
+def test_no_lifetime_from_rejected_first_page(clock: Clock) -> None:
+    """Test that a rejection right after a login teaches nothing."""
+    sqc = session.SQCSession(None, "http://sqc", "1234")
+    sqc.record_login()
+    sqc.mark_expired()
+
+    assert sqc.lifetime is None
+    sqc.record_login()
+    clock.now += 10
+    assert not sqc.expiring
+
+
+def test_lifetime_floor(clock: Clock) -> None:
+    """Test that an early expiry does not cause a login on every poll."""
+    sqc = session.SQCSession(None, "http://sqc", "1234")
+    sqc.record_login()
+    clock.now += 5
+    sqc.mark_valid()
+    sqc.mark_expired()
+
+    assert sqc.lifetime == session.MIN_LIFETIME
+
+
+def test_lifetime_recovers_after_reboot(clock: Clock) -> None:
+    """Test that a lifetime learned from a reboot grows back."""
+    sqc = session.SQCSession(None, "http://sqc", "1234")
+    sqc.record_login()
+    # The device reboots 45 seconds after the login.
+    for _ in range(4):
+        clock.now += 10
+        sqc.mark_valid()
+    sqc.mark_expired()
+    sqc.record_login()
+    assert sqc.lifetime == 40
+
+    logins = sqc.login_count
+    for _ in range(100):
+        clock.now += 10
+        _poll(sqc, 300)
+
+    # Far fewer logins than polls. The lifetime keeps probing beyond what
+    # the device accepted, by at most one growth past the next poll.
+    assert sqc.login_count - logins < 10
+    assert 200 <= sqc.lifetime <= 310 * session.LIFETIME_GROWTH